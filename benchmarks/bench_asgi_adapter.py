@@ -0,0 +1,83 @@
+"""
+Per-request overhead of the Azure Functions ASGI adapter.
+
+Compares building a new ``func.AsgiMiddleware`` on every invocation (the old
+``function_app.main`` behaviour) with reusing a single adapter per worker.
+Uses a minimal FastAPI app so the numbers isolate the adapter itself.
+
+Usage:
+    python benchmarks/bench_asgi_adapter.py [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+import azure.functions as func
+from fastapi import FastAPI
+
+app = FastAPI()
+
+
+@app.get("/ping")
+async def ping():
+    return {"ok": True}
+
+
+def _make_request() -> func.HttpRequest:
+    return func.HttpRequest(
+        method="GET",
+        url="http://localhost:7071/ping",
+        headers={},
+        params={},
+        route_params={"route": "ping"},
+        body=b"",
+    )
+
+
+async def _per_request(req: func.HttpRequest) -> func.HttpResponse:
+    return await func.AsgiMiddleware(app).handle_async(req)
+
+
+_shared = func.AsgiMiddleware(app)
+
+
+async def _reused(req: func.HttpRequest) -> func.HttpResponse:
+    return await _shared.handle_async(req)
+
+
+async def _measure(handler, requests: int) -> tuple[float, float]:
+    req = _make_request()
+    # Warm up so route compilation and first-call costs are excluded
+    for _ in range(100):
+        await handler(req)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await handler(req)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(requests):
+        await handler(req)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(
+        stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0
+    )
+    return elapsed / requests * 1e6, allocated / requests
+
+
+async def main(requests: int) -> None:
+    for name, handler in (("per-request adapter", _per_request), ("shared adapter", _reused)):
+        us_per_req, bytes_per_req = await _measure(handler, requests)
+        print(f"{name:<20} {us_per_req:8.1f} us/request  {bytes_per_req:8.0f} B retained/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
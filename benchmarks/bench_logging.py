@@ -0,0 +1,113 @@
+"""
+Cost of the app's logging on the request path: direct StreamHandler vs queued pipeline.
+
+Replays the INFO records a product listing request emits (the function
+entry point, the CRUD layer and the route, with their extra fields) through
+a logger wired up three ways, writing to a log file:
+
+- stream: a StreamHandler formatting and writing on the calling thread
+  (the pipeline before logging went through a queue)
+- queued: DeferredQueueHandler + QueueListener with the JsonFormatter, as
+  logging_config sets it up; the calling thread only enqueues records
+- queued, sampled: as above through a SampledLogger keeping --sample-rate
+  of INFO records
+
+Requests are spaced --gap-ms apart, standing in for the time a request
+spends awaiting Cosmos DB. Reports the time per request spent logging on
+the calling thread (the event loop, in the app) and, for the queued
+pipelines, how long the listener still needed to drain the queue after the
+last request.
+
+Usage:
+    python benchmarks/bench_logging.py [--requests 5000] [--gap-ms 0.5] [--sample-rate 0.1]
+"""
+
+import argparse
+import logging
+import logging.handlers
+import queue
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from inventory_api.logging_config import DeferredQueueHandler, JsonFormatter, SampledLogger  # noqa: E402
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def emit_request(logger: Union[logging.Logger, logging.LoggerAdapter]) -> None:
+    """The INFO records of one GET /products request."""
+    logger.info(
+        "Processing %s request",
+        "GET",
+        extra={
+            "method": "GET",
+            "path": "http://localhost:7071/products/?category=electronics",
+            "query_params": {"category": "electronics"},
+            "route": "products/",
+        },
+    )
+    logger.info("Retrieved %d products", 50, extra={"count": 50, "request_charge": 3.42})
+    logger.info("Successfully retrieved %d products", 50, extra={"count": 50})
+
+
+def run(
+    name: str,
+    logger: Union[logging.Logger, logging.LoggerAdapter],
+    requests: int,
+    gap: float,
+    listener: Optional[logging.handlers.QueueListener] = None,
+) -> None:
+    for _ in range(100):
+        emit_request(logger)
+    on_thread = 0.0
+    for _ in range(requests):
+        emit_start = time.perf_counter()
+        emit_request(logger)
+        on_thread += time.perf_counter() - emit_start
+        # Stands in for the request awaiting Cosmos DB, when the listener gets to run
+        time.sleep(gap)
+    line = f"{name:<18}{on_thread / requests * 1e6:14.2f}"
+    if listener:
+        drain_start = time.perf_counter()
+        listener.stop()
+        line += f"{(time.perf_counter() - drain_start) * 1e3:12.2f}"
+    print(line)
+
+
+def main(requests: int, sample_rate: float, gap: float) -> None:
+    print(f"{'pipeline':<18}{'us/request':>14}{'drain ms':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("stream", "queued", "queued, sampled"):
+            logger = logging.getLogger(f"bench_logging.{name}")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            file_handler = logging.FileHandler(Path(directory) / f"{name}.log")
+            listener = None
+            if name == "stream":
+                file_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+                logger.addHandler(file_handler)
+            else:
+                file_handler.setFormatter(JsonFormatter())
+                log_queue = queue.SimpleQueue()
+                listener = logging.handlers.QueueListener(log_queue, file_handler)
+                listener.start()
+                logger.addHandler(DeferredQueueHandler(log_queue))
+            if name == "queued, sampled":
+                run(name, SampledLogger(logger, sample_rate), requests, gap, listener)
+            else:
+                run(name, logger, requests, gap, listener)
+            file_handler.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="Requests' worth of records per pipeline")
+    parser.add_argument("--sample-rate", type=float, default=0.1, help="INFO sample rate of the sampled pipeline")
+    parser.add_argument("--gap-ms", type=float, default=0.5, help="Pause between requests")
+    args = parser.parse_args()
+    main(args.requests, args.sample_rate, args.gap_ms / 1000)
@@ -0,0 +1,190 @@
+"""
+Micro-benchmarks of the model validation and serialization hot paths.
+
+Covers request parsing (ProductCreate / ProductUpdate), ProductResponse
+validation of raw Cosmos DB documents (with last_updated stored, and derived
+from _ts by the model_validate override), the CRUD layer's document-to-model
+path (product_from_document / products_from_documents, which follow
+PRODUCT_VALIDATION_MODE), ProductList serialization at 50, 500 and 5000
+items, and the patch operations built by update_product.
+
+Each case is calibrated to run for about --min-time seconds per round and
+timed over --rounds rounds; min, median, mean, stddev and operations per
+second are reported, like pytest-benchmark. Results can be saved as a
+baseline and compared later; with --fail-over the script exits non-zero if
+any case's median got slower by more than the given percentage.
+
+Usage:
+    python benchmarks/bench_models.py [--rounds 7] [--min-time 0.2]
+        [--case validate_response] [--save-baseline models.json]
+        [--baseline models.json --fail-over 10]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from inventory_api.crud.product_crud import (  # noqa: E402
+    PRODUCT_VALIDATION_MODE,
+    product_from_document,
+    products_from_documents,
+    update_patch_operations,
+)
+from inventory_api.models.product import (  # noqa: E402
+    ProductCreate,
+    ProductList,
+    ProductResponse,
+    ProductUpdate,
+)
+
+CREATE_PAYLOAD = {
+    "name": "Wireless Mouse",
+    "description": "Ergonomic 2.4 GHz mouse",
+    "category": "Electronics",
+    "price": 24.99,
+    "sku": "WM-2024",
+    "quantity": 150,
+}
+UPDATE_PAYLOAD = {"price": 19.99, "quantity": 120, "status": "inactive"}
+
+
+def cosmos_document(index: int = 0, with_last_updated: bool = True) -> Dict[str, Any]:
+    """A product document shaped like a Cosmos DB read, system properties included."""
+    document = {
+        "id": str(uuid.UUID(int=index)),
+        "name": f"Product {index}",
+        "description": "Benchmark product",
+        "category": "electronics",
+        "price": 9.99 + index,
+        "sku": f"SKU-{index}",
+        "quantity": index % 500,
+        "status": "active",
+        "_rid": "Aq0XAKr2YQABAAAAAAAAAA==",
+        "_self": "dbs/Aq0XAA==/colls/Aq0XAKr2YQA=/docs/Aq0XAKr2YQABAAAAAAAAAA==/",
+        "_etag": '"0a00d4b8-0000-0700-0000-65f1c2a30000"',
+        "_attachments": "attachments/",
+        "_ts": 1710342819,
+    }
+    if with_last_updated:
+        document["last_updated"] = "2024-03-13T15:13:39.123456+00:00"
+    return document
+
+
+def product_list(size: int) -> ProductList:
+    return ProductList(
+        items=[ProductResponse.model_validate(cosmos_document(i)) for i in range(size)],
+        continuation_token="eyJ0b2tlbiI6IjEyMyJ9",
+    )
+
+
+def build_cases() -> Dict[str, Callable[[], Any]]:
+    raw_create = json.dumps(CREATE_PAYLOAD)
+    raw_update = json.dumps(UPDATE_PAYLOAD)
+    document = cosmos_document()
+    document_without_last_updated = cosmos_document(with_last_updated=False)
+    update = ProductUpdate.model_validate(UPDATE_PAYLOAD)
+
+    cases: Dict[str, Callable[[], Any]] = {
+        "parse_create_dict": lambda: ProductCreate.model_validate(CREATE_PAYLOAD),
+        "parse_create_json": lambda: ProductCreate.model_validate_json(raw_create),
+        "parse_update_dict": lambda: ProductUpdate.model_validate(UPDATE_PAYLOAD),
+        "parse_update_json": lambda: ProductUpdate.model_validate_json(raw_update),
+        "validate_response": lambda: ProductResponse.model_validate(document),
+        # The override writes last_updated into its input, so each call gets a fresh copy
+        "validate_response_from_ts": lambda: ProductResponse.model_validate(dict(document_without_last_updated)),
+        "product_from_document": lambda: product_from_document(document),
+        "update_patch_operations": lambda: update_patch_operations(update),
+    }
+    for size in (50, 500, 5000):
+        documents = [cosmos_document(i) for i in range(size)]
+        products = product_list(size)
+        cases[f"validate_page_{size}"] = lambda documents=documents: [
+            ProductResponse.model_validate(item) for item in documents
+        ]
+        cases[f"products_from_documents_{size}"] = lambda documents=documents: products_from_documents(documents)
+        cases[f"serialize_list_json_{size}"] = lambda products=products: products.model_dump_json(by_alias=True)
+        cases[f"serialize_list_dump_{size}"] = lambda products=products: json.dumps(
+            products.model_dump(mode="json", by_alias=True)
+        )
+    return cases
+
+
+def _calibrate(function: Callable[[], Any], min_time: float) -> int:
+    """Return how many calls make one round last at least min_time."""
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        if time.perf_counter() - start >= min_time:
+            return iterations
+        iterations *= 2
+
+
+def measure(function: Callable[[], Any], rounds: int, min_time: float) -> Dict[str, float]:
+    iterations = _calibrate(function, min_time)
+    timings: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        timings.append((time.perf_counter() - start) / iterations)
+    return {
+        "min_us": min(timings) * 1e6,
+        "median_us": statistics.median(timings) * 1e6,
+        "mean_us": statistics.fmean(timings) * 1e6,
+        "stddev_us": (statistics.stdev(timings) if len(timings) > 1 else 0.0) * 1e6,
+        "ops": 1 / statistics.median(timings),
+    }
+
+
+def main(args: argparse.Namespace) -> int:
+    cases = build_cases()
+    names = args.case or list(cases)
+    baseline = json.loads(Path(args.baseline).read_text())["results"] if args.baseline else {}
+
+    print(f"PRODUCT_VALIDATION_MODE={PRODUCT_VALIDATION_MODE}")
+    header = f"{'case':<28}{'min us':>11}{'median us':>11}{'mean us':>11}{'stddev':>10}{'ops/s':>12}"
+    print(header + (f"{'Δmedian':>10}" if baseline else ""))
+    results: Dict[str, Dict[str, float]] = {}
+    regressed = []
+    for name in names:
+        stats = results[name] = measure(cases[name], args.rounds, args.min_time)
+        line = (
+            f"{name:<28}{stats['min_us']:11.2f}{stats['median_us']:11.2f}{stats['mean_us']:11.2f}"
+            f"{stats['stddev_us']:10.2f}{stats['ops']:12.0f}"
+        )
+        previous = baseline.get(name)
+        if previous:
+            change = (stats["median_us"] - previous["median_us"]) / previous["median_us"] * 100
+            line += f"{change:+9.1f}%"
+            if args.fail_over is not None and change > args.fail_over:
+                regressed.append(name)
+        print(line)
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps({"results": results}, indent=2))
+        print(f"Baseline saved to {args.save_baseline}")
+    if regressed:
+        print(f"Slower by more than {args.fail_over}%: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=7, help="Timed rounds per case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per round")
+    parser.add_argument("--case", action="append", help="Run only these cases")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results to a baseline file")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a saved baseline")
+    parser.add_argument("--fail-over", type=float, metavar="PERCENT", help="Exit 1 if a median regressed by more than this")
+    args = parser.parse_args()
+    sys.exit(main(args))
@@ -0,0 +1,437 @@
+"""
+Load test of every product route, in-process, against the in-memory backend.
+
+Each scenario sends requests through ``function_app.main`` (the Functions
+entry point, the shared ASGI adapter, FastAPI, the routers and the CRUD
+layer) to an ``InMemoryContainerProxy`` with configurable latency and
+throttling, so the numbers cover the app's own per-request cost plus the
+simulated round trips.
+
+Reports p50/p95/p99 latency, throughput and memory allocated per request
+(tracemalloc peak, measured in a separate sequential pass). Results can be
+saved as a baseline and later runs compared against it; with --fail-over the
+script exits non-zero if any scenario's p50 or p95 regressed by more than the
+given percentage.
+
+Usage:
+    python benchmarks/bench_routes.py [--requests 500] [--concurrency 16]
+        [--latency-ms 2] [--jitter-ms 1] [--throttle-rate 0]
+        [--scenario get_product --scenario list_products]
+        [--save-baseline baseline.json] [--baseline baseline.json --fail-over 10]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("COSMOSDB_BACKEND", "memory")
+
+import azure.functions as func  # noqa: E402
+
+import function_app  # noqa: E402
+from inventory_api.crud.product_crud_reservation import create_reservation  # noqa: E402
+from inventory_api.db import ContainerType, use_container  # noqa: E402
+from inventory_api.memory_backend import InMemoryContainerProxy  # noqa: E402
+from inventory_api.models.reservation import ReservationCreate  # noqa: E402
+
+CATEGORIES = ["electronics", "books", "toys", "garden"]
+BATCH_SIZE = 10
+
+
+class RequestSpec(NamedTuple):
+    method: str
+    path: str
+    params: Dict[str, str] = {}
+    body: Optional[Any] = None
+    headers: Dict[str, str] = {}
+    expected_status: int = 200
+
+
+class Bench:
+    """Seeded container plus the helpers scenarios use to build requests."""
+
+    def __init__(self, container: InMemoryContainerProxy, seed_products: int):
+        self.container = container
+        self.seed_products = seed_products
+        self.products: List[Dict[str, Any]] = []
+        self._counter = 0
+
+    def new_product(self, category: Optional[str] = None) -> Dict[str, Any]:
+        self._counter += 1
+        return {
+            "name": f"Product {self._counter}",
+            "description": "Benchmark product",
+            "category": category or CATEGORIES[self._counter % len(CATEGORIES)],
+            "price": 9.99,
+            "sku": f"SKU-{self._counter}",
+            "quantity": 1000,
+        }
+
+    async def insert(self, category: Optional[str] = None) -> Dict[str, Any]:
+        """Store a product directly, bypassing the API (untimed setup)."""
+        product = self.new_product(category)
+        document = {
+            **product,
+            "id": str(uuid.uuid4()),
+            "status": "active",
+            "last_updated": "2024-01-01T00:00:00+00:00",
+        }
+        return await self.container.create_item(body=document)
+
+    async def hold(self) -> Dict[str, Any]:
+        """Hold one unit of a seeded product, bypassing the API (untimed setup)."""
+        product = self.pick()
+        reservation = ReservationCreate(product_id=product["id"], category=product["category"], quantity=1)
+        held = await create_reservation(self.container, reservation)
+        return {"id": held.id, "category": held.category}
+
+    async def seed(self) -> None:
+        self.products = [await self.insert() for _ in range(self.seed_products)]
+
+    def pick(self) -> Dict[str, Any]:
+        self._counter += 1
+        return self.products[self._counter % len(self.products)]
+
+    async def fresh(self, product: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.container.read_item(item=product["id"], partition_key=product["category"])
+
+
+Scenario = Callable[[Bench], Awaitable[RequestSpec]]
+
+
+async def get_product(bench: Bench) -> RequestSpec:
+    product = bench.pick()
+    return RequestSpec("GET", f"products/{product['id']}", {"category": product["category"]})
+
+
+async def get_product_not_modified(bench: Bench) -> RequestSpec:
+    product = await bench.fresh(bench.pick())
+    return RequestSpec(
+        "GET",
+        f"products/{product['id']}",
+        {"category": product["category"]},
+        headers={"If-None-Match": product["_etag"]},
+        expected_status=304,
+    )
+
+
+async def list_products(bench: Bench) -> RequestSpec:
+    return RequestSpec("GET", "products/", {"category": bench.pick()["category"], "limit": "50"})
+
+
+async def list_products_fields(bench: Bench) -> RequestSpec:
+    params = {"category": bench.pick()["category"], "limit": "50", "fields": "id,name,price,quantity"}
+    return RequestSpec("GET", "products/", params)
+
+
+async def list_categories(bench: Bench) -> RequestSpec:
+    return RequestSpec("GET", "products/categories")
+
+
+async def product_stats(bench: Bench) -> RequestSpec:
+    return RequestSpec("GET", "products/stats")
+
+
+async def export_category(bench: Bench) -> RequestSpec:
+    return RequestSpec("GET", "products/export", {"category": bench.pick()["category"]})
+
+
+async def export_all(bench: Bench) -> RequestSpec:
+    return RequestSpec("GET", "products/export/all")
+
+
+async def create_product(bench: Bench) -> RequestSpec:
+    return RequestSpec("POST", "products/", body=bench.new_product(), expected_status=201)
+
+
+async def update_product(bench: Bench) -> RequestSpec:
+    # Requests are built ahead of the run, so each one gets its own product and ETag
+    product = await bench.insert()
+    return RequestSpec(
+        "PATCH",
+        f"products/{product['id']}",
+        {"category": product["category"]},
+        body={"price": 19.99, "quantity": 500},
+        headers={"If-Match": product["_etag"]},
+    )
+
+
+async def adjust_stock(bench: Bench) -> RequestSpec:
+    product = bench.pick()
+    return RequestSpec(
+        "POST", f"products/{product['id']}/stock", {"category": product["category"]}, body={"delta": 1}
+    )
+
+
+async def delete_product(bench: Bench) -> RequestSpec:
+    product = await bench.insert()
+    return RequestSpec(
+        "DELETE", f"products/{product['id']}", {"category": product["category"]}, expected_status=204
+    )
+
+
+async def batch_create(bench: Bench) -> RequestSpec:
+    items = [bench.new_product() for _ in range(BATCH_SIZE)]
+    return RequestSpec("POST", "products/batch/", body={"items": items}, expected_status=201)
+
+
+async def batch_update(bench: Bench) -> RequestSpec:
+    items = []
+    for _ in range(BATCH_SIZE):
+        product = await bench.insert()
+        items.append({
+            "id": product["id"],
+            "category": product["category"],
+            "_etag": product["_etag"],
+            "changes": {"price": 14.99},
+        })
+    return RequestSpec("PATCH", "products/batch/", body={"items": items})
+
+
+async def batch_delete(bench: Bench) -> RequestSpec:
+    products = [await bench.insert() for _ in range(BATCH_SIZE)]
+    items = [{"id": product["id"], "category": product["category"]} for product in products]
+    return RequestSpec("DELETE", "products/batch/", body={"items": items})
+
+
+async def batch_stock(bench: Bench) -> RequestSpec:
+    items = [{"id": p["id"], "category": p["category"], "delta": 1} for p in (bench.pick() for _ in range(BATCH_SIZE))]
+    return RequestSpec("POST", "products/batch/stock", body={"items": items})
+
+
+async def batch_create_bulk(bench: Bench) -> RequestSpec:
+    items = [bench.new_product() for _ in range(BATCH_SIZE)]
+    return RequestSpec("POST", "products/batch/", {"mode": "bulk"}, body={"items": items}, expected_status=201)
+
+
+async def batch_update_bulk(bench: Bench) -> RequestSpec:
+    spec = await batch_update(bench)
+    return spec._replace(params={"mode": "bulk"})
+
+
+async def batch_delete_bulk(bench: Bench) -> RequestSpec:
+    spec = await batch_delete(bench)
+    return spec._replace(params={"mode": "bulk"})
+
+
+async def create_reservation_hold(bench: Bench) -> RequestSpec:
+    product = bench.pick()
+    body = {"product_id": product["id"], "category": product["category"], "quantity": 1}
+    return RequestSpec("POST", "products/reservations/", body=body, expected_status=201)
+
+
+async def confirm_reservation(bench: Bench) -> RequestSpec:
+    hold = await bench.hold()
+    return RequestSpec("POST", f"products/reservations/{hold['id']}/confirm", {"category": hold["category"]})
+
+
+async def release_reservation(bench: Bench) -> RequestSpec:
+    hold = await bench.hold()
+    return RequestSpec("POST", f"products/reservations/{hold['id']}/release", {"category": hold["category"]})
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.__name__: scenario
+    for scenario in (
+        get_product,
+        get_product_not_modified,
+        list_products,
+        list_products_fields,
+        list_categories,
+        product_stats,
+        export_category,
+        export_all,
+        create_product,
+        update_product,
+        adjust_stock,
+        delete_product,
+        batch_create,
+        batch_update,
+        batch_delete,
+        batch_stock,
+        batch_create_bulk,
+        batch_update_bulk,
+        batch_delete_bulk,
+        create_reservation_hold,
+        confirm_reservation,
+        release_reservation,
+    )
+}
+
+
+def _http_request(spec: RequestSpec) -> func.HttpRequest:
+    params = dict(spec.params)
+    query = "&".join(f"{key}={value}" for key, value in params.items())
+    return func.HttpRequest(
+        method=spec.method,
+        url=f"http://localhost:7071/{spec.path}" + (f"?{query}" if query else ""),
+        headers={"x-functions-key": "benchmark", "content-type": "application/json", **spec.headers},
+        params=params,
+        route_params={"route": spec.path},
+        body=json.dumps(spec.body).encode() if spec.body is not None else b"",
+    )
+
+
+async def _send(handler, spec: RequestSpec) -> float:
+    req = _http_request(spec)
+    start = time.perf_counter()
+    response = await handler(req)
+    elapsed = time.perf_counter() - start
+    if response.status_code != spec.expected_status:
+        raise RuntimeError(
+            f"{spec.method} /{spec.path} returned {response.status_code}: {response.get_body()[:200]!r}"
+        )
+    return elapsed
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(handler, bench: Bench, scenario: Scenario, requests: int, concurrency: int) -> Dict[str, float]:
+    # Warm up so route compilation and first-call costs are excluded
+    for _ in range(min(20, requests)):
+        await _send(handler, await scenario(bench))
+
+    specs = [await scenario(bench) for _ in range(requests)]
+    queue: asyncio.Queue = asyncio.Queue()
+    for spec in specs:
+        queue.put_nowait(spec)
+    latencies: List[float] = []
+
+    async def worker() -> None:
+        while not queue.empty():
+            latencies.append(await _send(handler, queue.get_nowait()))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    # Sequential pass so the peak belongs to a single request
+    samples = max(1, min(50, requests // 10))
+    alloc_specs = [await scenario(bench) for _ in range(samples)]
+    peaks = []
+    tracemalloc.start()
+    for spec in alloc_specs:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        await _send(handler, spec)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "rps": requests / wall,
+        "alloc_kib": statistics.fmean(peaks) / 1024,
+    }
+
+
+def _change(current: float, previous: float) -> float:
+    return (current - previous) / previous * 100 if previous else 0.0
+
+
+def report(
+    results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]]
+) -> Dict[str, Tuple[float, float]]:
+    """Print the results table; return each compared scenario's p50 and p95 change in percent."""
+    header = f"{'scenario':<26}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'KiB/req':>9}"
+    if baseline:
+        header += f"{'Δp50':>9}{'Δp95':>9}{'Δreq/s':>9}"
+    print(header)
+    changes: Dict[str, Tuple[float, float]] = {}
+    for name, stats in results.items():
+        line = (
+            f"{name:<26}{stats['p50_ms']:9.2f}{stats['p95_ms']:9.2f}{stats['p99_ms']:9.2f}"
+            f"{stats['rps']:9.0f}{stats['alloc_kib']:9.1f}"
+        )
+        previous = (baseline or {}).get(name)
+        if previous:
+            changes[name] = (
+                _change(stats["p50_ms"], previous["p50_ms"]),
+                _change(stats["p95_ms"], previous["p95_ms"]),
+            )
+            line += f"{changes[name][0]:+8.1f}%{changes[name][1]:+8.1f}%{_change(stats['rps'], previous['rps']):+8.1f}%"
+        print(line)
+    return changes
+
+
+async def main(args: argparse.Namespace) -> int:
+    if not logging.getLogger().handlers:
+        # The Functions host owns the root logger; without a handler there,
+        # azure.functions' first logging.debug() would basicConfig() a second,
+        # synchronous stderr copy of every app record
+        logging.getLogger().addHandler(logging.NullHandler())
+    logging.getLogger().setLevel(args.log_level)
+    logging.getLogger("inventory_api").setLevel(args.log_level)
+
+    container = InMemoryContainerProxy(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        throttle_rate=args.throttle_rate,
+    )
+    use_container(ContainerType.PRODUCTS, container)
+    bench = Bench(container, args.seed_products)
+    await bench.seed()
+
+    handler = next(
+        function.get_user_function()
+        for function in function_app.function_app.get_functions()
+        if function.get_function_name() == "main"
+    )
+
+    names = args.scenario or list(SCENARIOS)
+    results = {}
+    for name in names:
+        results[name] = await run_scenario(handler, bench, SCENARIOS[name], args.requests, args.concurrency)
+
+    await function_app.asgi_middleware.notify_shutdown()
+
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+    changes = report(results, baseline)
+
+    if args.save_baseline:
+        settings = {key: getattr(args, key) for key in ("requests", "concurrency", "latency_ms", "jitter_ms", "throttle_rate", "seed_products")}
+        Path(args.save_baseline).write_text(json.dumps({"settings": settings, "results": results}, indent=2))
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.fail_over is not None:
+        regressed = [name for name, (p50, p95) in changes.items() if max(p50, p95) > args.fail_over]
+        if regressed:
+            print(f"Regressed by more than {args.fail_over}%: {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Timed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight at once")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Simulated latency per backend call")
+    parser.add_argument("--jitter-ms", type=float, default=1.0, help="Random extra backend latency")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of backend calls answered with 429")
+    parser.add_argument("--seed-products", type=int, default=400, help="Products stored before the run")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="Run only these scenarios")
+    parser.add_argument("--log-level", default="WARNING", help="Level of the app loggers during the run")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results to a baseline file")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a saved baseline")
+    parser.add_argument("--fail-over", type=float, metavar="PERCENT", help="Exit 1 if p50/p95 regressed by more than this")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,110 @@
+"""
+Serialization cost of ProductList responses: FastAPI response_model vs ORJSONResponse.
+
+Times whole requests through a minimal FastAPI app (called as ASGI, no
+server), one route per strategy, each returning the same pre-validated
+ProductList:
+
+- response_model: the route returns the model and FastAPI validates it
+  against response_model and serializes it (the old behaviour)
+- response_model + orjson class: as above with ORJSONResponse as the
+  response class, i.e. only swapping the encoder
+- ORJSONResponse(model): the route returns the response itself, skipping
+  FastAPI's validation and serialization (what the routes do now)
+
+Usage:
+    python benchmarks/bench_serialization.py [--sizes 50 1000] [--requests 1000]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI  # noqa: E402
+
+from bench_models import product_list  # noqa: E402
+from inventory_api.models.product import ProductList  # noqa: E402
+from inventory_api.responses import ORJSONResponse  # noqa: E402
+
+
+def build_app(products: ProductList) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/response-model", response_model=ProductList)
+    async def response_model():
+        return products
+
+    @app.get("/response-model-orjson", response_model=ProductList, response_class=ORJSONResponse)
+    async def response_model_orjson():
+        return products
+
+    @app.get("/orjson-response", response_model=ProductList)
+    async def orjson_response():
+        return ORJSONResponse(products)
+
+    return app
+
+
+async def _request(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 1),
+        "server": ("localhost", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def main(sizes: list[int], requests: int) -> None:
+    print(f"{'items':>6}  {'strategy':<30}{'us/request':>12}{'bytes':>10}")
+    for size in sizes:
+        app = build_app(product_list(size))
+        paths = {
+            "response_model": "/response-model",
+            "response_model + orjson class": "/response-model-orjson",
+            "ORJSONResponse(model)": "/orjson-response",
+        }
+        for name, path in paths.items():
+            # Warm up so route compilation and first-call costs are excluded
+            for _ in range(10):
+                payload = await _request(app, path)
+            count = max(20, requests * 50 // size)
+            rounds = []
+            for _ in range(3):
+                start = time.perf_counter()
+                for _ in range(count):
+                    await _request(app, path)
+                rounds.append((time.perf_counter() - start) / count)
+            # Best of three rounds, to keep GC pauses and noise out
+            elapsed = min(rounds)
+            print(f"{size:>6}  {name:<30}{elapsed * 1e6:12.0f}{len(payload):10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 1000], help="ProductList sizes")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per round at 50 items (scaled down for larger lists)")
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.requests))
@@ -1,3 +1,7 @@
+import asyncio
+import atexit
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
 
 import azure.functions as func
 from fastapi import (
@@ -7,14 +11,23 @@ from fastapi import (
     status,
     Request,
 )
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse
 from azure.cosmos import exceptions as cosmos_exceptions
+import opentelemetry.trace
 from fastapi.security import APIKeyHeader, APIKeyQuery
 from fastapi.openapi.docs import get_swagger_ui_html
 
-from inventory_api.logging_config import logger, tracer
+from inventory_api.crud.product_crud_reservation import release_expired_reservations
+from inventory_api.db import close_client, get_products_container, warm_up
+from inventory_api.logging_config import get_child_logger, tracer
+from inventory_api.request_metrics import start_request_metrics
+from inventory_api.responses import ORJSONResponse
 from inventory_api.routes.product_route import router as product_router
 from inventory_api.routes.product_route_batch import router as product_batch_router
+from inventory_api.routes.product_route_export import router as product_export_router
+from inventory_api.routes.product_route_reservation import router as product_reservation_router
+
+logger = get_child_logger("function_app")
 
 API_KEY_NAME = "x-functions-key"
 api_key_header_scheme = APIKeyHeader(
@@ -54,12 +67,33 @@ async def get_api_key(
     return client_api_key
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Warm up the Cosmos DB client on startup and close it on shutdown."""
+    with tracer.start_as_current_span("lifespan_warm_up") as span:
+        try:
+            await warm_up()
+            logger.info("Cosmos DB client warmed up")
+        except Exception as e:
+            # Don't block the worker; requests fall back to lazy initialization
+            span.set_attribute("error", True)
+            span.set_attribute("error.type", type(e).__name__)
+            logger.warning(
+                "Cosmos DB warm-up failed",
+                extra={"error_type": type(e).__name__},
+                exc_info=True,
+            )
+    yield
+    await close_client()
+
+
 app = FastAPI(
     title="Inventory API",
     version="1.0.0",
     openapi_url="/api/openapi.json",  # Keep this, app.openapi() will use it
     docs_url=None,  # Disable default /docs
     redoc_url=None,  # Optionally disable /redoc
+    default_response_class=ORJSONResponse,
     openapi_components={
         "securitySchemes": {
             api_key_header_scheme.scheme_name: api_key_header_scheme.model.model_dump(
@@ -71,6 +105,7 @@ app = FastAPI(
         }
     },
     dependencies=[Security(get_api_key)],
+    lifespan=lifespan,
 )
 
 
@@ -124,7 +159,7 @@ async def check_api_key_for_docs(request: Request, call_next):
             ) or request.query_params.get("code")
 
             if not client_api_key or client_api_key != azure_expected_key:
-                return JSONResponse(
+                return ORJSONResponse(
                     status_code=status.HTTP_403_FORBIDDEN,
                     content={
                         "detail": "Access to documentation requires a valid API key."
@@ -134,6 +169,20 @@ async def check_api_key_for_docs(request: Request, call_next):
     return response
 
 
+@app.middleware("http")
+async def add_request_metrics(request: Request, call_next):
+    """
+    Report the Cosmos DB request charge and backend latency of each request
+    as X-Request-Charge / Server-Timing headers and span attributes.
+    """
+    metrics = start_request_metrics()
+    response = await call_next(request)
+    # Streamed responses only include the work done before the body starts
+    response.headers.update(metrics.response_headers())
+    opentelemetry.trace.get_current_span().set_attributes(metrics.span_attributes())
+    return response
+
+
 @app.exception_handler(cosmos_exceptions.CosmosHttpResponseError)
 async def handle_cosmos_http_error(
     request: Request, exc: cosmos_exceptions.CosmosHttpResponseError
@@ -148,7 +197,7 @@ async def handle_cosmos_http_error(
                 "Cosmos DB authentication error", 
                 extra={"status_code": exc.status_code, "path": request.url.path}
             )
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=exc.status_code,
                 content={
                     "detail": "Unauthorized" if exc.status_code == 401 else "Forbidden"
@@ -159,11 +208,11 @@ async def handle_cosmos_http_error(
             "Cosmos DB HTTP error", 
             extra={
                 "status_code": exc.status_code, 
-                "message": str(exc),
+                "error_message": str(exc),
                 "path": request.url.path
             }
         )
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"detail": str(exc)},
         )
@@ -171,15 +220,160 @@ async def handle_cosmos_http_error(
 
 @app.exception_handler(ValueError)
 async def handle_value_error(_: Request, exc: ValueError):
-    return JSONResponse(status_code=400, content={"detail": str(exc)})
+    return ORJSONResponse(status_code=400, content={"detail": str(exc)})
 
 
-app.include_router(product_router)
+# Registered before product_router so /products/export, /products/batch/stock and
+# /products/reservations aren't taken as product IDs
+app.include_router(product_export_router)
 app.include_router(product_batch_router)
+app.include_router(product_reservation_router)
+app.include_router(product_router)
+
+
+class LifespanAsgiMiddleware(func.AsgiMiddleware):
+    """
+    AsgiMiddleware that is created once per worker and drives the ASGI
+    lifespan protocol.
+
+    azure-functions 1.17 never sends lifespan events, so without this the
+    FastAPI startup/shutdown hooks would not run. Startup happens on the warmup
+    trigger or the first invocation, whichever comes first (the worker's event
+    loop does not exist at import time), and shutdown is attempted when the
+    worker process exits.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._state: Dict[str, Any] = {}
+        self._startup_lock: Optional[asyncio.Lock] = None
+        self._started = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lifespan_task: Optional[asyncio.Task] = None
+        self._lifespan_queue: Optional[asyncio.Queue] = None
+        self._startup_complete: Optional[asyncio.Future] = None
+        self._shutdown_complete: Optional[asyncio.Future] = None
+
+    async def handle_async(self, req: func.HttpRequest, context=None):
+        if not self._started:
+            await self.ensure_started()
+        return await self._handle_async(req, context)
+
+    async def ensure_started(self) -> None:
+        """Run lifespan startup once; safe to call concurrently."""
+        if self._startup_lock is None:
+            self._startup_lock = asyncio.Lock()
+        async with self._startup_lock:
+            if not self._started:
+                await self.notify_startup()
+
+    async def notify_startup(self) -> None:
+        """Send lifespan.startup to the app and wait for it to complete."""
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._lifespan_queue = asyncio.Queue()
+        self._startup_complete = loop.create_future()
+        self._shutdown_complete = loop.create_future()
+
+        scope = {
+            "type": "lifespan",
+            "asgi": {"version": "3.0", "spec_version": "2.0"},
+            "state": self._state,
+        }
+        self._lifespan_task = loop.create_task(self._run_lifespan(scope))
+        await self._lifespan_queue.put({"type": "lifespan.startup"})
+        try:
+            await self._startup_complete
+        finally:
+            # Mark as started even on failure so a broken startup hook does
+            # not get retried (and fail again) on every request.
+            self._started = True
+
+    async def notify_shutdown(self) -> None:
+        """Send lifespan.shutdown to the app and wait for it to complete."""
+        if not self._started or self._lifespan_task is None:
+            return
+        await self._lifespan_queue.put({"type": "lifespan.shutdown"})
+        await self._shutdown_complete
+        self._started = False
+
+    async def _run_lifespan(self, scope: Dict[str, Any]) -> None:
+        try:
+            await self._app(scope, self._lifespan_receive, self._lifespan_send)
+        except Exception as e:
+            logger.warning(
+                "ASGI lifespan not supported or failed",
+                extra={"error_type": type(e).__name__},
+            )
+        finally:
+            # Unblock any waiter if the app returned without completing.
+            for future in (self._startup_complete, self._shutdown_complete):
+                if not future.done():
+                    future.set_result(None)
+
+    async def _lifespan_receive(self) -> Dict[str, Any]:
+        return await self._lifespan_queue.get()
+
+    async def _lifespan_send(self, message: Dict[str, Any]) -> None:
+        message_type = message["type"]
+        if message_type == "lifespan.startup.complete":
+            self._startup_complete.set_result(None)
+        elif message_type == "lifespan.startup.failed":
+            logger.error(
+                "Lifespan startup failed", extra={"lifespan_message": message.get("message")}
+            )
+            self._startup_complete.set_result(None)
+        elif message_type == "lifespan.shutdown.complete":
+            self._shutdown_complete.set_result(None)
+        elif message_type == "lifespan.shutdown.failed":
+            logger.error(
+                "Lifespan shutdown failed", extra={"lifespan_message": message.get("message")}
+            )
+            self._shutdown_complete.set_result(None)
+
+    def shutdown_at_exit(self) -> None:
+        """Best-effort lifespan shutdown when the worker process exits."""
+        loop = self._loop
+        if loop is None or loop.is_closed() or loop.is_running():
+            return
+        try:
+            loop.run_until_complete(self.notify_shutdown())
+        except Exception as e:
+            logger.warning(
+                "Error running lifespan shutdown at exit",
+                extra={"error_type": type(e).__name__},
+            )
+
+
+# One adapter per worker process, reused by every invocation
+asgi_middleware = LifespanAsgiMiddleware(app)
+atexit.register(asgi_middleware.shutdown_at_exit)
 
 function_app = func.FunctionApp()
 
 
+@function_app.warm_up_trigger("warmup_context")
+async def warmup(warmup_context) -> None:
+    """Run lifespan startup (Cosmos DB warm-up) before the instance takes traffic."""
+    await asgi_middleware.ensure_started()
+
+
+@function_app.timer_trigger(schedule="0 */1 * * * *", arg_name="timer", use_monitor=False)
+async def expire_reservations(timer: func.TimerRequest) -> None:
+    """Return the stock of lapsed reservation holds every minute."""
+    await asgi_middleware.ensure_started()
+    with tracer.start_as_current_span("expire_reservations"):
+        try:
+            container = await get_products_container()
+            await release_expired_reservations(container)
+        except Exception as e:
+            logger.error(
+                f"Error releasing expired reservations: {str(e)}",
+                extra={"error_type": type(e).__name__},
+                exc_info=True,
+            )
+
+
 @function_app.route(route="{*route}", auth_level=func.AuthLevel.FUNCTION)
 async def main(req: func.HttpRequest) -> func.HttpResponse:
     """Azure Functions entry‑point routed through FastAPI."""
@@ -190,7 +384,8 @@ async def main(req: func.HttpRequest) -> func.HttpResponse:
         span.set_attribute("http.route", req.route_params.get('route', ''))
         
         logger.info(
-            f"Processing {req.method} request",
+            "Processing %s request",
+            req.method,
             extra={
                 "method": req.method,
                 "path": str(req.url),
@@ -200,7 +395,7 @@ async def main(req: func.HttpRequest) -> func.HttpResponse:
         )
         
         try:
-            response = await func.AsgiMiddleware(app).handle_async(req)
+            response = await asgi_middleware.handle_async(req)
             span.set_attribute("http.status_code", response.status_code)
             return response
         except Exception as e:
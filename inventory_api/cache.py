@@ -0,0 +1,308 @@
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+import os
+import time
+
+from inventory_api.logging_config import get_child_logger
+from inventory_api.models.product import CategoryStats, ProductResponse
+
+# Create a child logger for this module
+logger = get_child_logger("cache")
+
+
+class CachedProduct(NamedTuple):
+    product: ProductResponse
+    fresh: bool
+
+
+class ProductCache:
+    """
+    Bounded LRU cache of validated products keyed by (normalized category, id).
+
+    Entries are served without a database round trip until their TTL expires;
+    after that they are only returned for ETag revalidation. The cache is
+    per worker process, so other instances may see a write up to one TTL late.
+
+    Every write or invalidation gives its key a new version. Reads take the
+    version before going to Cosmos DB and their result is dropped if a write
+    happened meanwhile, so a slow read can't replace a newer product.
+    """
+
+    def __init__(self, max_items: int, ttl_seconds: float):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[ProductResponse, float]]" = OrderedDict()
+        # Write sequence number of each recently written key, oldest first. Keys
+        # dropped from it report the newest dropped number, so reads started
+        # before a forgotten write still come out stale
+        self._versions: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._write_sequence = 0
+        self._version_floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_items > 0
+
+    def lookup(self, category: str, product_id: str) -> Optional[CachedProduct]:
+        """Return the cached product and whether it is still within its TTL."""
+        entry = self._entries.get((category, product_id))
+        if entry is None:
+            self.misses += 1
+            return None
+        product, expires_at = entry
+        fresh = time.monotonic() < expires_at
+        if fresh:
+            self.hits += 1
+            self._entries.move_to_end((category, product_id))
+        else:
+            self.misses += 1
+        return CachedProduct(product, fresh)
+
+    def version(self, category: str, product_id: str) -> int:
+        """Version to pass to put() or revalidated() for a read started now."""
+        return self._versions.get((category, product_id), self._version_floor)
+
+    def put(self, product: ProductResponse, version: Optional[int] = None) -> None:
+        """
+        Cache a product.
+
+        Args:
+            product: Product to cache
+            version: For reads, version() taken before the read; the product is
+                dropped if the key was written since. Writes leave it out.
+        """
+        if not self.enabled:
+            return
+        key = (product.category, product.id)
+        if version is None:
+            self._bump_version(key)
+        elif self.version(*key) != version:
+            return
+        self._entries[key] = (product, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def revalidated(self, product: ProductResponse, version: int) -> None:
+        """Extend an entry's TTL after Cosmos DB confirmed its ETag (304)."""
+        self.revalidations += 1
+        self.put(product, version)
+
+    def invalidate(self, category: str, product_id: str) -> None:
+        if self.enabled:
+            self._bump_version((category, product_id))
+        self._entries.pop((category, product_id), None)
+
+    def _bump_version(self, key: Tuple[str, str]) -> None:
+        self._write_sequence += 1
+        self._versions[key] = self._write_sequence
+        self._versions.move_to_end(key)
+        # Only reads in flight need a version, so a few times the cache size is plenty
+        while len(self._versions) > self.max_items * 4:
+            _, sequence = self._versions.popitem(last=False)
+            self._version_floor = sequence
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cache.size": len(self._entries),
+            "cache.hits": self.hits,
+            "cache.misses": self.misses,
+            "cache.evictions": self.evictions,
+            "cache.revalidations": self.revalidations,
+        }
+
+
+product_cache = ProductCache(
+    max_items=int(os.environ.get("PRODUCT_CACHE_MAX_ITEMS", "1024")),
+    ttl_seconds=float(os.environ.get("PRODUCT_CACHE_TTL_SECONDS", "30")),
+)
+
+
+class CategoryCatalog:
+    """
+    In-memory set of product categories, maintained incrementally on writes.
+
+    The full (cross-partition) category query only runs on the first read and
+    when the TTL has expired; an expired catalog is still served while a
+    background task refreshes it. Creates add their category directly, and
+    deletes trigger a single-partition check of whether the category is now
+    empty. Like the product cache, this is per worker process.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._categories: Optional[Set[str]] = None
+        self._expires_at = 0.0
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Bumped on every add so a stale refresh or emptiness check can't undo it
+        self._generations: Dict[str, int] = {}
+        self._added_during_refresh: Optional[Set[str]] = None
+        self._pending_checks: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.loads = 0
+
+    async def get(self, loader: Callable[[], Awaitable[Iterable[str]]]) -> List[str]:
+        """
+        Return the sorted categories, loading them on first use.
+
+        Args:
+            loader: Coroutine function reading every category from the database
+        """
+        if self._categories is None:
+            if self._load_lock is None:
+                self._load_lock = asyncio.Lock()
+            async with self._load_lock:
+                if self._categories is None:
+                    await self._reload(loader)
+        else:
+            self.hits += 1
+            if time.monotonic() >= self._expires_at and self._refresh_task is None:
+                self._refresh_task = self._spawn(self._background_refresh(loader))
+        return sorted(self._categories)
+
+    def add(self, category: str) -> None:
+        """Record that a product was written in a category."""
+        self._generations[category] = self._generations.get(category, 0) + 1
+        if self._added_during_refresh is not None:
+            self._added_during_refresh.add(category)
+        if self._categories is not None:
+            self._categories.add(category)
+
+    def removed_from(
+        self, category: str, is_empty: Callable[[str], Awaitable[bool]]
+    ) -> None:
+        """
+        Record that products were deleted from a category.
+
+        Schedules a background check and drops the category if it is now empty.
+
+        Args:
+            category: Normalized category the products were deleted from
+            is_empty: Coroutine function checking whether a category has no products
+        """
+        if self._categories is None or category not in self._categories:
+            return
+        if category in self._pending_checks:
+            return
+        self._pending_checks.add(category)
+        self._spawn(self._check_empty(category, is_empty))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "categories.size": len(self._categories or ()),
+            "categories.hits": self.hits,
+            "categories.loads": self.loads,
+        }
+
+    async def _reload(self, loader: Callable[[], Awaitable[Iterable[str]]]) -> None:
+        self._added_during_refresh = set()
+        try:
+            categories = set(await loader())
+            # Keep categories written while the query was running
+            categories |= self._added_during_refresh
+        finally:
+            self._added_during_refresh = None
+        self._categories = categories
+        self._expires_at = time.monotonic() + self.ttl_seconds
+        self.loads += 1
+
+    async def _background_refresh(self, loader: Callable[[], Awaitable[Iterable[str]]]) -> None:
+        try:
+            await self._reload(loader)
+        except Exception as e:
+            # Keep serving the previous catalog; the next read retries
+            logger.warning(
+                "Category catalog refresh failed",
+                extra={"error_type": type(e).__name__},
+                exc_info=True,
+            )
+        finally:
+            self._refresh_task = None
+
+    async def _check_empty(
+        self, category: str, is_empty: Callable[[str], Awaitable[bool]]
+    ) -> None:
+        generation = self._generations.get(category, 0)
+        try:
+            empty = await is_empty(category)
+        except Exception as e:
+            logger.warning(
+                "Category emptiness check failed",
+                extra={"category": category, "error_type": type(e).__name__},
+                exc_info=True,
+            )
+            return
+        finally:
+            self._pending_checks.discard(category)
+        if empty and self._generations.get(category, 0) == generation and self._categories is not None:
+            self._categories.discard(category)
+
+    def _spawn(self, coroutine: Awaitable[None]) -> asyncio.Task:
+        task = asyncio.ensure_future(coroutine)
+        # Hold a reference so the task isn't garbage collected mid-flight
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+
+class CategoryStatsCache:
+    """
+    Per-category inventory aggregates, computed on demand and cached.
+
+    Writes invalidate their category, so a stats request only recomputes
+    categories that changed; the TTL bounds staleness from writes made by
+    other instances.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[CategoryStats, float]] = {}
+        # Bumped on invalidation so an aggregate started before a write isn't cached
+        self._versions: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, category: str) -> Optional[CategoryStats]:
+        entry = self._entries.get(category)
+        if entry is None or time.monotonic() >= entry[1]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def version(self, category: str) -> int:
+        return self._versions.get(category, 0)
+
+    def put(self, stats: CategoryStats, version: int) -> None:
+        """Cache stats computed when the category was at the given version."""
+        if self._versions.get(stats.category, 0) != version:
+            return
+        self._entries[stats.category] = (stats, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, category: str) -> None:
+        self._versions[category] = self._versions.get(category, 0) + 1
+        self._entries.pop(category, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "stats_cache.size": len(self._entries),
+            "stats_cache.hits": self.hits,
+            "stats_cache.misses": self.misses,
+        }
+
+
+category_catalog = CategoryCatalog(
+    ttl_seconds=float(os.environ.get("CATEGORY_CACHE_TTL_SECONDS", "300")),
+)
+
+category_stats_cache = CategoryStatsCache(
+    ttl_seconds=float(os.environ.get("STATS_CACHE_TTL_SECONDS", "60")),
+)
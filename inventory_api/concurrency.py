@@ -0,0 +1,128 @@
+import asyncio
+import os
+import time
+from typing import Optional
+
+from azure.cosmos.exceptions import CosmosBatchOperationError, CosmosHttpResponseError
+from opentelemetry.metrics import Observation
+
+from inventory_api.logging_config import get_child_logger, meter
+from inventory_api.request_metrics import BackendCall
+
+# Create a child logger for this module
+logger = get_child_logger("concurrency")
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD (additive increase, multiplicative decrease) concurrency limiter.
+
+    Callers acquire a slot before each Cosmos DB call and release it with the
+    outcome. Every success grows the window by about one slot per window's
+    worth of calls; a throttled call (429) shrinks it by decrease_factor, at
+    most once per cooldown, and pauses new calls for the server's retry-after.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        decrease_factor: float = 0.5,
+        decrease_cooldown_seconds: float = 1.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown_seconds = decrease_cooldown_seconds
+        self._window = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._resume_at = 0.0
+        self._next_decrease_at = 0.0
+        self._condition = asyncio.Condition()
+        self.throttle_count = 0
+        self.success_count = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of calls allowed in flight."""
+        return max(self.min_limit, int(self._window))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a free slot, honoring any retry-after pause."""
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def release(self, throttled: bool = False, retry_after_seconds: float = 0.0) -> None:
+        """Free a slot and adjust the window based on the call's outcome."""
+        async with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                self._on_throttled(retry_after_seconds)
+            else:
+                self.success_count += 1
+                self._window = min(self.max_limit, self._window + 1.0 / self._window)
+            self._condition.notify_all()
+
+    def _on_throttled(self, retry_after_seconds: float) -> None:
+        self.throttle_count += 1
+        now = time.monotonic()
+        if now >= self._next_decrease_at:
+            self._window = max(self.min_limit, self._window * self.decrease_factor)
+            self._next_decrease_at = now + self.decrease_cooldown_seconds
+            logger.warning(
+                "Cosmos DB throttling; reducing concurrency",
+                extra={"limit": self.limit, "retry_after_seconds": retry_after_seconds},
+            )
+        if retry_after_seconds > 0:
+            self._resume_at = max(self._resume_at, now + retry_after_seconds)
+
+
+def throttle_signal(error: Optional[Exception] = None, call: Optional[BackendCall] = None) -> Optional[float]:
+    """
+    Classify a Cosmos DB call outcome for the limiter.
+
+    Returns the retry-after in seconds if the call was throttled, either as a
+    final 429 error or with 429s the SDK retried internally (seen through the
+    call's track_backend_call() record), otherwise None.
+    """
+    if isinstance(error, (CosmosHttpResponseError, CosmosBatchOperationError)):
+        if error.status_code != 429:
+            return None
+        headers = error.headers or {}
+        return float(headers.get("x-ms-retry-after-ms", 0) or 0) / 1000.0
+    if call is not None and call.throttled_attempts:
+        # The SDK already waited out the retry-after before succeeding
+        return 0.0
+    return None
+
+
+# Shared by every batch and bulk path in this worker
+batch_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=int(os.environ.get("BATCH_INITIAL_CONCURRENCY", "8")),
+    max_limit=int(os.environ.get("BATCH_MAX_CONCURRENCY", "64")),
+)
+
+meter.create_observable_gauge(
+    "batch.concurrency.limit",
+    callbacks=[lambda options: [Observation(batch_limiter.limit)]],
+    description="Current adaptive concurrency window for batch operations",
+)
+meter.create_observable_gauge(
+    "batch.concurrency.in_flight",
+    callbacks=[lambda options: [Observation(batch_limiter.in_flight)]],
+    description="Batch operations currently in flight",
+)
+meter.create_observable_counter(
+    "batch.throttles",
+    callbacks=[lambda options: [Observation(batch_limiter.throttle_count)]],
+    description="Throttled (429) batch operations",
+)
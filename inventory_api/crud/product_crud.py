@@ -1,18 +1,22 @@
 from azure.cosmos.exceptions import CosmosHttpResponseError
 from azure.cosmos.aio import ContainerProxy
+import os
 import uuid
-from typing import Optional
+from typing import Any, Dict, List, Optional, Union
 from datetime import datetime, timezone
 from builtins import anext
 
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from inventory_api.models.product import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
     ProductList,
+    ProductFields,
+    ProductFieldsList,
     ProductStatus,
+    StockAdjustment,
 )
 
 from inventory_api.exceptions import (
@@ -20,13 +24,59 @@ from inventory_api.exceptions import (
     ProductAlreadyExistsError,
     DatabaseError,
     PreconditionFailedError,
+    ProductNotModifiedError,
+    StockConditionFailedError,
 )
 
+from inventory_api.cache import category_catalog, category_stats_cache, product_cache
 from inventory_api.logging_config import get_child_logger, tracer
 
 # Create a child logger for this module
 logger = get_child_logger("crud.product")
 
+# "trusted": documents this service wrote go straight through the compiled
+# validator, a whole page per call. "strict": every document goes through
+# ProductResponse.model_validate, including its _ts fallback for last_updated.
+PRODUCT_VALIDATION_MODE = os.environ.get("PRODUCT_VALIDATION_MODE", "trusted").strip().lower()
+
+_product_adapter = TypeAdapter(ProductResponse)
+_product_page_adapter = TypeAdapter(List[ProductResponse])
+
+
+def product_from_document(document: Dict[str, Any]) -> ProductResponse:
+    """
+    Build a ProductResponse from a product document returned by Cosmos DB.
+
+    Raises:
+        ValidationError: If the document is not a valid product
+    """
+    if PRODUCT_VALIDATION_MODE != "strict":
+        try:
+            return _product_adapter.validate_python(document)
+        except ValidationError:
+            # Not in the shape this service writes; take the full path below
+            pass
+    return ProductResponse.model_validate(document)
+
+
+def products_from_documents(documents: List[Dict[str, Any]]) -> List[ProductResponse]:
+    """
+    Build ProductResponses from a page of product documents, skipping invalid ones.
+    """
+    if PRODUCT_VALIDATION_MODE != "strict":
+        try:
+            return _product_page_adapter.validate_python(documents)
+        except ValidationError:
+            # Validate one by one so only the offending documents are dropped
+            pass
+    products = []
+    for document in documents:
+        try:
+            products.append(ProductResponse.model_validate(document))
+        except ValidationError as e:
+            logger.debug("Pydantic validation errors: %s", e.errors())
+    return products
+
 
 def normalize_category(category: str) -> str:
     """
@@ -41,19 +91,72 @@ def normalize_category(category: str) -> str:
     return category.lower().strip()
 
 
+# Excludes the reservation holds stored alongside products (they carry a "type")
+PRODUCT_DOCUMENTS_FILTER = "NOT IS_DEFINED(c.type)"
+
+
+# Fields clients may project, mapped to their Cosmos DB document property
+PROJECTABLE_FIELDS = {
+    "id": "id",
+    "name": "name",
+    "description": "description",
+    "category": "category",
+    "price": "price",
+    "sku": "sku",
+    "quantity": "quantity",
+    "etag": "_etag",
+    "status": "status",
+    "last_updated": "last_updated",
+}
+
+
+def build_select_clause(fields: Optional[List[str]]) -> str:
+    """
+    Compile requested field names into a Cosmos DB SELECT clause.
+
+    Args:
+        fields: Field names to project, or None for the whole document
+
+    Returns:
+        The SELECT clause, e.g. "SELECT c.id, c.name"
+
+    Raises:
+        ValueError: If a field is not projectable
+    """
+    if not fields:
+        return "SELECT *"
+
+    unknown = [field for field in fields if field not in PROJECTABLE_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {unknown}. Valid options: {list(PROJECTABLE_FIELDS.keys())}"
+        )
+
+    # Always return the id so projected items stay addressable
+    properties = ["id"] + [
+        PROJECTABLE_FIELDS[field] for field in dict.fromkeys(fields) if field != "id"
+    ]
+    return "SELECT " + ", ".join(f"c.{prop}" for prop in properties)
+
+
 async def list_products(
     container: ContainerProxy,
     category: str,
     continuation_token: Optional[str] = None,
     max_items: int = 50,
-) -> ProductList:
+    fields: Optional[List[str]] = None,
+) -> Union[ProductList, ProductFieldsList]:
     """
     Retrieve a paginated list of products by category.
+
+    When fields are given, only those properties are read from Cosmos DB and
+    the page is returned as a ProductFieldsList.
     """
     with tracer.start_as_current_span("list_products") as span:
         span.set_attribute("category", category)
         span.set_attribute("max_items", max_items)
         span.set_attribute("has_continuation_token", continuation_token is not None)
+        span.set_attribute("fields", ",".join(fields) if fields else "*")
         
         logger.info(
             "Listing products", 
@@ -67,11 +170,25 @@ async def list_products(
         # Normalize category for case-insensitive search
         normalized_category = normalize_category(category)
         
-        query = "SELECT * FROM c WHERE UPPER(c.category) = UPPER(@category)"
+        # Categories are stored normalized, so a plain equality can use the index
+        query = (
+            f"{build_select_clause(fields)} FROM c "
+            f"WHERE c.category = @category AND {PRODUCT_DOCUMENTS_FILTER}"
+        )
         params = [{"name": "@category", "value": normalized_category}]
 
+        # Sum the RU charge of every backend response that makes up the page
+        request_charge = 0.0
+
+        def capture_request_charge(headers, _):
+            nonlocal request_charge
+            request_charge += float(headers.get("x-ms-request-charge", 0))
+
         # Create query options dictionary
-        query_options = {"max_item_count": max_items}
+        query_options = {
+            "max_item_count": max_items,
+            "response_hook": capture_request_charge,
+        }
 
         try:
             items = []
@@ -79,7 +196,10 @@ async def list_products(
 
             # Represents the entire potential result set of the query
             query_iterator = container.query_items(
-                query=query, parameters=params, partition_key=category, **query_options
+                query=query,
+                parameters=params,
+                partition_key=normalized_category,
+                **query_options,
             )
 
             # Mechanism to get page (subset) of total result set at a time
@@ -93,18 +213,24 @@ async def list_products(
                 page_items = [item async for item in page]
 
                 # Process items in the page
-                for item in page_items:
-                    try:
-                        product = ProductResponse.model_validate(item)
-                        items.append(product)
-                    except ValidationError as e:
-                        logger.debug(f"Pydantic validation errors: {e.errors()}")
-                        continue
+                if fields:
+                    for item in page_items:
+                        try:
+                            items.append(ProductFields.model_validate(item))
+                        except ValidationError as e:
+                            logger.debug("Pydantic validation errors: %s", e.errors())
+                            continue
+                else:
+                    items = products_from_documents(page_items)
 
                 # Get continuation token for next page from the page_iterator
                 next_continuation_token = page_iterator.continuation_token
                 
-                logger.info(f"Retrieved {len(items)} products", extra={"count": len(items)})
+                logger.info(
+                    "Retrieved %d products",
+                    len(items),
+                    extra={"count": len(items), "request_charge": request_charge},
+                )
                 span.set_attribute("products.count", len(items))
                 span.set_attribute("has_more_results", next_continuation_token is not None)
 
@@ -112,6 +238,10 @@ async def list_products(
                 logger.info("No results found or end of results reached")
                 span.set_attribute("products.count", 0)
 
+            span.set_attribute("db.request_charge_per_page", request_charge)
+
+            if fields:
+                return ProductFieldsList(items=items, continuation_token=next_continuation_token)
             return ProductList(items=items, continuation_token=next_continuation_token)
 
         except CosmosHttpResponseError as e:
@@ -123,7 +253,7 @@ async def list_products(
                 "Cosmos DB error during product listing",
                 extra={
                     "status_code": e.status_code, 
-                    "message": e.message,
+                    "error_message": e.message,
                     "category": category
                 },
                 exc_info=True,
@@ -196,7 +326,11 @@ async def create_product(
                 "Product created successfully",
                 extra={"product_id": data["id"], "category": data["category"]}
             )
-            return ProductResponse.model_validate(result)
+            product = product_from_document(result)
+            product_cache.put(product)
+            category_catalog.add(product.category)
+            category_stats_cache.invalidate(product.category)
+            return product
         except CosmosHttpResponseError as e:
             span.set_attribute("error", True)
             span.set_attribute("error.type", "cosmos_http_error")
@@ -215,7 +349,7 @@ async def create_product(
                 "Cosmos DB error during product creation",
                 extra={
                     "status_code": e.status_code,
-                    "message": e.message,
+                    "error_message": e.message,
                     "product_id": data["id"],
                     "category": data["category"]
                 },
@@ -245,7 +379,10 @@ async def create_product(
 
 
 async def get_product_by_id(
-    container: ContainerProxy, product_id: str, category: str
+    container: ContainerProxy,
+    product_id: str,
+    category: str,
+    if_none_match: Optional[str] = None,
 ) -> ProductResponse:
     """
     Retrieve a product by its ID and category.
@@ -254,11 +391,13 @@ async def get_product_by_id(
         container: Cosmos DB container client
         product_id: ID of the product to retrieve
         category: Category of the product (partition key)
+        if_none_match: ETag the caller already holds, for a conditional read
 
     Returns:
         The retrieved product details
 
     Raises:
+        ProductNotModifiedError: If if_none_match is the product's current ETag
         ProductNotFoundError: If the product doesn't exist
         DatabaseError: If a database operation fails
     """
@@ -269,20 +408,58 @@ async def get_product_by_id(
         # Add attributes to span for tracing
         span.set_attribute("product.id", product_id)
         span.set_attribute("product.category", normalized_category)
+        span.set_attribute("conditional", if_none_match is not None)
         
         logger.info(
             "Retrieving product by ID",
             extra={"product_id": product_id, "category": normalized_category}
         )
         
+        cached = product_cache.lookup(normalized_category, product_id)
+        span.set_attribute("cache.hit", cached is not None and cached.fresh)
+        if cached is not None and cached.fresh:
+            span.set_attributes(product_cache.stats())
+            if if_none_match is not None and cached.product.etag == if_none_match:
+                raise ProductNotModifiedError(f"Product with ID '{product_id}' not modified")
+            return cached.product
+
+        # Prefer revalidating an expired cache entry: a 304 then lets us answer
+        # whichever ETag the client holds. Otherwise pass the client's ETag on.
+        conditional_etag = cached.product.etag if cached is not None else if_none_match
+        # Taken before the read so a write finishing meanwhile isn't overwritten
+        cache_version = product_cache.version(normalized_category, product_id)
+
         try:
-            item = await container.read_item(item=product_id, partition_key=normalized_category)
-            logger.info(
-                "Product retrieved successfully",
-                extra={"product_id": product_id, "category": category}
+            read_options = {}
+            if conditional_etag is not None:
+                # Cosmos DB answers 304 with an empty body if the ETag still matches
+                read_options["initial_headers"] = {"If-None-Match": conditional_etag}
+
+            item = await container.read_item(
+                item=product_id, partition_key=normalized_category, **read_options
             )
-            return ProductResponse.model_validate(item)
+
+            product = None
+            not_a_product = False
+            if conditional_etag is not None and not item:
+                span.set_attribute("not_modified", True)
+                if cached is not None:
+                    product_cache.revalidated(cached.product, cache_version)
+                    product = cached.product
+            elif "type" in item:
+                # Reservation holds live in the product's partition but aren't products
+                not_a_product = True
+            else:
+                logger.info(
+                    "Product retrieved successfully",
+                    extra={"product_id": product_id, "category": category}
+                )
+                product = product_from_document(item)
+                product_cache.put(product, cache_version)
+            span.set_attributes(product_cache.stats())
         except CosmosHttpResponseError as e:
+            if e.status_code == 404:
+                product_cache.invalidate(normalized_category, product_id)
             span.set_attribute("error", True)
             span.set_attribute("error.type", "cosmos_http_error")
             span.set_attribute("error.status_code", e.status_code)
@@ -302,7 +479,7 @@ async def get_product_by_id(
                     "product_id": product_id,
                     "category": category,
                     "status_code": e.status_code,
-                    "message": e.message
+                    "error_message": e.message
                 },
                 exc_info=True,
             )
@@ -328,6 +505,18 @@ async def get_product_by_id(
                 original_exception=e,
             ) from e
 
+        if not_a_product:
+            logger.warning(
+                "Product not found",
+                extra={"product_id": product_id, "category": category, "document_type": item["type"]}
+            )
+            raise ProductNotFoundError(
+                f"Product with ID '{product_id}' and category '{category}' not found"
+            )
+        if product is None or (if_none_match is not None and product.etag == if_none_match):
+            raise ProductNotModifiedError(f"Product with ID '{product_id}' not modified")
+        return product
+
 
 async def update_product(
     container: ContainerProxy,
@@ -354,37 +543,39 @@ async def update_product(
         PreconditionFailedError: If the ETag doesn't match (concurrent update)
         DatabaseError: If a database operation fails
     """
-    update_dict = updates.model_dump(exclude_unset=True)
-
     # If no fields are provided for update, raise an error
-    if not update_dict:
+    if not updates.model_fields_set:
         raise ValueError("No fields provided for update.")
 
     # Normalize category for consistent lookup
     normalized_category = normalize_category(category)
 
-    # Update the last_updated field
-    update_dict["last_updated"] = datetime.now(timezone.utc).isoformat()
+    patch_operations = update_patch_operations(updates)
 
-    # Create list of patch (set) operations
-    patch_operations = []
-    for key, value in update_dict.items():
-        if key not in ["id", "category", "_etag"]: # Exclude system fields
-            patch_operations.append({"op": "set", "path": f"/{key}", "value": value})
+    # Drop the cached copy whatever the outcome; it's replaced on success
+    product_cache.invalidate(normalized_category, product_id)
 
     try:
         result = await container.patch_item(
             item=product_id,
             partition_key=normalized_category,
             patch_operations=patch_operations,
+            filter_predicate=product_filter_predicate(),
             headers={"if-match": etag}, # ETag for concurrency control
         )
-        return ProductResponse.model_validate(result)
+        product = product_from_document(result)
+        product_cache.put(product)
+        category_stats_cache.invalidate(normalized_category)
+        return product
     except CosmosHttpResponseError as e:
         if e.status_code == 404:
             raise ProductNotFoundError(
                 f"Product with ID '{product_id}' and category '{category}' not found"
             ) from e
+        if e.status_code == 412 and await is_reservation_hold(container, product_id, normalized_category):
+            raise ProductNotFoundError(
+                f"Product with ID '{product_id}' and category '{category}' not found"
+            ) from e
         if e.status_code == 412:  # Precondition Failed (ETag mismatch)
             raise PreconditionFailedError(
                 f"Product with ID '{product_id}' has been modified since last retrieved (ETag mismatch)."
@@ -405,6 +596,168 @@ async def update_product(
         ) from e
 
 
+def product_filter_predicate(condition: Optional[str] = None) -> str:
+    """
+    Build a patch filter predicate that only matches product documents.
+
+    Patching by ID would otherwise also reach the reservation holds stored
+    in a product's partition. A condition such as "c.quantity >= 3" is ANDed in.
+    """
+    if condition is None:
+        return f"FROM c WHERE {PRODUCT_DOCUMENTS_FILTER}"
+    return f"FROM c WHERE {PRODUCT_DOCUMENTS_FILTER} AND {condition}"
+
+
+def stock_condition(adjustment: StockAdjustment) -> Optional[str]:
+    """
+    Build the quantity condition guarding a stock adjustment.
+
+    Returns:
+        A condition such as "c.quantity >= 3", or None if the adjustment is
+        unconditional
+    """
+    required = adjustment.min_quantity
+    if adjustment.delta < 0 and not adjustment.allow_negative:
+        # Enough stock to take delta units without going below zero
+        required = max(required or 0, -adjustment.delta)
+    if required is None:
+        return None
+    # Values are validated ints, so inlining them into the predicate is safe
+    return f"c.quantity >= {int(required)}"
+
+
+def stock_filter_predicate(adjustment: StockAdjustment) -> str:
+    """
+    Build the Cosmos DB filter predicate guarding a stock adjustment.
+
+    Returns:
+        A predicate such as "FROM c WHERE NOT IS_DEFINED(c.type) AND c.quantity >= 3"
+    """
+    return product_filter_predicate(stock_condition(adjustment))
+
+
+async def is_reservation_hold(container: ContainerProxy, item_id: str, partition_key: str) -> bool:
+    """
+    Check whether a document is a reservation hold rather than a product.
+
+    Used to tell a write refused by product_filter_predicate apart from one
+    refused by its own condition, and before deletes, which take no predicate.
+    A missing document is not a hold.
+    """
+    try:
+        document = await container.read_item(item=item_id, partition_key=partition_key)
+    except CosmosHttpResponseError as e:
+        if e.status_code == 404:
+            return False
+        raise
+    return "type" in document
+
+
+def update_patch_operations(updates: ProductUpdate) -> List[dict]:
+    """Patch operations setting the fields present in an update and stamping last_updated."""
+    update_dict = updates.model_dump(exclude_unset=True)
+    update_dict["last_updated"] = datetime.now(timezone.utc).isoformat()
+    return [
+        {"op": "set", "path": f"/{key}", "value": value}
+        for key, value in update_dict.items()
+        if key not in ["id", "category", "_etag"]  # Exclude system fields
+    ]
+
+
+def stock_patch_operations(delta: int) -> List[dict]:
+    """Patch operations adding delta to the quantity and stamping last_updated."""
+    return [
+        {"op": "incr", "path": "/quantity", "value": delta},
+        {"op": "set", "path": "/last_updated", "value": datetime.now(timezone.utc).isoformat()},
+    ]
+
+
+async def adjust_stock(
+    container: ContainerProxy,
+    product_id: str,
+    category: str,
+    adjustment: StockAdjustment,
+) -> ProductResponse:
+    """
+    Atomically add to or remove from a product's quantity.
+
+    Uses a patch "incr" with an optional filter predicate, so concurrent
+    adjustments never conflict on the ETag and need no prior read.
+
+    Args:
+        container: Cosmos DB container client
+        product_id: ID of the product to adjust
+        category: Category of the product (partition key)
+        adjustment: Quantity change and its condition
+
+    Returns:
+        The product with its new quantity
+
+    Raises:
+        ProductNotFoundError: If the product doesn't exist
+        StockConditionFailedError: If the quantity condition is not met
+        DatabaseError: If a database operation fails
+    """
+    if adjustment.delta == 0:
+        raise ValueError("delta must not be zero.")
+
+    normalized_category = normalize_category(category)
+    filter_predicate = stock_filter_predicate(adjustment)
+
+    with tracer.start_as_current_span("adjust_stock") as span:
+        span.set_attribute("product.id", product_id)
+        span.set_attribute("product.category", normalized_category)
+        span.set_attribute("stock.delta", adjustment.delta)
+        span.set_attribute("stock.conditional", stock_condition(adjustment) is not None)
+
+        product_cache.invalidate(normalized_category, product_id)
+        try:
+            result = await container.patch_item(
+                item=product_id,
+                partition_key=normalized_category,
+                patch_operations=stock_patch_operations(adjustment.delta),
+                filter_predicate=filter_predicate,
+            )
+            product = product_from_document(result)
+            product_cache.put(product)
+            category_stats_cache.invalidate(normalized_category)
+            return product
+        except CosmosHttpResponseError as e:
+            span.set_attribute("error", True)
+            span.set_attribute("error.type", "cosmos_http_error")
+            span.set_attribute("error.status_code", e.status_code)
+
+            if e.status_code == 404:
+                raise ProductNotFoundError(
+                    f"Product with ID '{product_id}' and category '{category}' not found"
+                ) from e
+            if e.status_code == 412 and await is_reservation_hold(container, product_id, normalized_category):
+                raise ProductNotFoundError(
+                    f"Product with ID '{product_id}' and category '{category}' not found"
+                ) from e
+            if e.status_code == 412:  # Filter predicate not satisfied
+                raise StockConditionFailedError(
+                    f"Insufficient stock for product '{product_id}' to apply a change of {adjustment.delta}."
+                ) from e
+            logger.error(
+                f"Cosmos DB error during stock adjustment: Status Code {e.status_code}, Message: {e.message}",
+                exc_info=True,
+            )
+            raise DatabaseError(
+                f"Cosmos DB error during stock adjustment: Status Code {e.status_code}, Message: {e.message}",
+                original_exception=e,
+            ) from e
+        except Exception as e:
+            span.set_attribute("error", True)
+            span.set_attribute("error.type", type(e).__name__)
+
+            logger.error(f"Unexpected error during stock adjustment: {e}", exc_info=True)
+            raise DatabaseError(
+                "An unexpected error occurred during database operation.",
+                original_exception=e,
+            ) from e
+
+
 async def delete_product(
     container: ContainerProxy,
     product_id: str,
@@ -424,10 +777,23 @@ async def delete_product(
     """
     # Normalize category for consistent lookup
     normalized_category = normalize_category(category)
+    product_cache.invalidate(normalized_category, product_id)
     
     try:
+        # Deletes take no filter predicate, so holds are turned away up front.
+        # IDs are never reused, so the document can't change type in between.
+        if await is_reservation_hold(container, product_id, normalized_category):
+            raise ProductNotFoundError(
+                f"Product with ID '{product_id}' and category '{category}' not found"
+            )
         await container.delete_item(item=product_id, partition_key=normalized_category)
+        category_stats_cache.invalidate(normalized_category)
+        category_catalog.removed_from(
+            normalized_category, lambda category: is_category_empty(container, category)
+        )
         return  # Implicit None
+    except ProductNotFoundError:
+        raise
     except CosmosHttpResponseError as e:
         if e.status_code == 404:
             raise ProductNotFoundError(
@@ -449,23 +815,49 @@ async def delete_product(
         ) from e
 
 
+async def is_category_empty(container: ContainerProxy, category: str) -> bool:
+    """
+    Check whether a category has no products left.
+
+    Runs a single-partition TOP 1 query, so it costs a few RUs whatever the
+    size of the container.
+    """
+    query_iterator = container.query_items(
+        query=f"SELECT TOP 1 c.id FROM c WHERE {PRODUCT_DOCUMENTS_FILTER}",
+        partition_key=category,
+    )
+    async for _ in query_iterator:
+        return False
+    return True
+
+
+async def _query_categories(container: ContainerProxy) -> list[str]:
+    """Read every distinct category with a cross-partition query."""
+    with tracer.start_as_current_span("query_categories") as span:
+        query = f"SELECT DISTINCT VALUE c.category FROM c WHERE {PRODUCT_DOCUMENTS_FILTER}"
+        categories = [category async for category in container.query_items(query=query) if category]
+        span.set_attribute("categories.count", len(categories))
+        return categories
+
+
 async def list_categories(container: ContainerProxy) -> list[str]:
+    """
+    List product categories from the per-worker category catalog.
+
+    The catalog is loaded with a cross-partition DISTINCT query on first use,
+    kept current by product writes, and refreshed in the background once its
+    TTL expires.
+    """
     with tracer.start_as_current_span('list_categories') as span:
         logger.info('Listing categories')
         
-        query = "SELECT DISTINCT c.category FROM c"
         try:
-            
-            categories = []
-            query_iterator = container.query_items(query=query)
-            
-            async for item in query_iterator:
-                if "category" in item and item ["category"]:
-                    categories.append(item["category"])
-                    
+            categories = await category_catalog.get(lambda: _query_categories(container))
+
             count = len(categories)
-            logger.info(f"Retrieved {count} categories", extra={"count": count})
+            logger.info("Retrieved %d categories", count, extra={"count": count})
             span.set_attribute("categories.count", count)
+            span.set_attributes(category_catalog.stats())
             return categories
         except CosmosHttpResponseError as e:
             span.set_attribute("error", True)
@@ -474,7 +866,7 @@ async def list_categories(container: ContainerProxy) -> list[str]:
             
             logger.error(
                 "Cosmos DB error during category listing",
-                extra={"status_code": e.status_code, "message": e.message},
+                extra={"status_code": e.status_code, "error_message": e.message},
                 exc_info=True,
             )
             raise DatabaseError(
@@ -2,22 +2,43 @@ import asyncio
 from collections import defaultdict
 from azure.cosmos.exceptions import CosmosHttpResponseError, CosmosBatchOperationError
 from azure.cosmos.aio import ContainerProxy
+import json
+import time
 import uuid
-from typing import Any, Dict, List, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
 from datetime import datetime, timezone
-import logging
+from pydantic import ValidationError
 
+from inventory_api.cache import category_catalog, category_stats_cache, product_cache
+from inventory_api.concurrency import batch_limiter, throttle_signal
+from inventory_api.crud.product_crud import (
+    is_category_empty,
+    is_reservation_hold,
+    product_filter_predicate,
+    product_from_document,
+    stock_filter_predicate,
+    stock_patch_operations,
+    update_patch_operations,
+)
+from inventory_api.logging_config import get_child_logger, tracer
+from inventory_api.request_metrics import track_backend_call
 from inventory_api.models.product import (
     ProductBatchCreate,
     ProductCreate,
     ProductResponse,
     ProductBatchUpdate,
     ProductBatchDelete,
-    ProductStatus
+    ProductBatchStock,
+    ProductBatchStockItem,
+    ProductStatus,
+    BulkItemStatus,
+    ProductBulkItemResult,
+    ProductBulkResult,
 )
 
 
-logger = logging.getLogger(__name__)
+# Create a child logger for this module
+logger = get_child_logger("crud.product_batch")
 
 def normalize_category(category: str) -> str:
     """
@@ -31,6 +52,203 @@ def normalize_category(category: str) -> str:
     """
     return category.lower().strip()
 
+
+BatchOperation = Tuple[str, Tuple[Any, ...], Dict[str, Any]]
+
+# Cosmos DB transactional batch limits
+MAX_BATCH_OPERATIONS = 100
+# The hard limit is 2 MB per request; leave headroom for the batch envelope
+MAX_BATCH_PAYLOAD_BYTES = 1_900_000
+# Fixed per-operation overhead (operationType, id, ifMatch, ...) in the envelope
+_OPERATION_OVERHEAD_BYTES = 128
+
+
+def _new_product_document(product: ProductCreate) -> Dict[str, Any]:
+    """Build the stored document for a product to create."""
+    data = product.model_dump()
+    data["id"] = str(uuid.uuid4())
+    data["status"] = ProductStatus.ACTIVE.value
+    data["last_updated"] = datetime.now(timezone.utc).isoformat()
+
+    # Normalize category for consistent storage
+    data["category"] = normalize_category(data["category"])
+    return data
+
+
+def _committed_product(document: Dict[str, Any], operation_name: str) -> Optional[ProductResponse]:
+    """
+    Build the ProductResponse of a write Cosmos DB already committed.
+
+    The write stands whether or not its body maps to a product, so a
+    validation failure is logged and the item reported without its product
+    instead of as failed.
+    """
+    try:
+        return product_from_document(document)
+    except ValidationError as e:
+        logger.error(
+            "Committed %s returned a document that is not a valid product",
+            operation_name,
+            extra={"product_id": document.get("id"), "validation_errors": str(e.errors())},
+        )
+        return None
+
+
+async def _reservation_holds(container: ContainerProxy, category_pk: str, item_ids: List[str]) -> Set[str]:
+    """
+    Return the IDs among item_ids that are reservation holds or could not be checked.
+
+    Transactional batch deletes take no filter predicate, so these are left
+    out of the batch rather than risk deleting a hold.
+    """
+    checks = await asyncio.gather(
+        *(is_reservation_hold(container, item_id, category_pk) for item_id in item_ids),
+        return_exceptions=True,
+    )
+    return {item_id for item_id, is_hold in zip(item_ids, checks) if is_hold is not False}
+
+
+def chunk_batch_operations(
+    operations: List[BatchOperation],
+    max_operations: int = MAX_BATCH_OPERATIONS,
+    max_payload_bytes: int = MAX_BATCH_PAYLOAD_BYTES,
+) -> List[Tuple[int, int]]:
+    """
+    Split a partition's operations into chunks that fit one transactional batch.
+
+    Args:
+        operations: Batch operations for a single partition key
+        max_operations: Maximum operations per chunk
+        max_payload_bytes: Maximum estimated payload size per chunk
+
+    Returns:
+        (start, end) index ranges into operations, one per chunk
+    """
+    chunks = []
+    start = 0
+    payload_bytes = 0
+    for index, (_, args, _) in enumerate(operations):
+        size = len(json.dumps(args, default=str)) + _OPERATION_OVERHEAD_BYTES
+        if index > start and (
+            index - start >= max_operations or payload_bytes + size > max_payload_bytes
+        ):
+            chunks.append((start, index))
+            start = index
+            payload_bytes = 0
+        payload_bytes += size
+    if start < len(operations):
+        chunks.append((start, len(operations)))
+    return chunks
+
+
+class ChunkOutcome(NamedTuple):
+    """Result of one transactional batch chunk."""
+
+    item_ids: List[str]
+    results: Optional[List[Dict[str, Any]]]  # None if the chunk failed
+    # Per-operation responses of a failed batch (statusCode per operation)
+    error_responses: Optional[List[Dict[str, Any]]] = None
+    status_code: Optional[int] = None
+
+
+def _result_body(result_item: Any) -> Optional[Dict[str, Any]]:
+    """Return the document from a batch operation result, if it has one."""
+    if not isinstance(result_item, dict):
+        return None
+    body = result_item.get("resourceBody", result_item)
+    return body if isinstance(body, dict) and body.get("id") else None
+
+
+async def _execute_in_chunks(
+    container: ContainerProxy,
+    category_pk: str,
+    operations: List[BatchOperation],
+    item_ids: List[str],
+    operation_name: str,
+) -> List[ChunkOutcome]:
+    """
+    Execute a partition's operations as transactional batches within Cosmos DB limits.
+
+    Each chunk is atomic on its own, but chunks commit independently, so a
+    failed chunk does not roll back the others. Chunks in flight are bounded
+    by the shared adaptive batch_limiter.
+
+    Returns:
+        One ChunkOutcome per chunk, in order
+    """
+    chunks = chunk_batch_operations(operations)
+
+    async def run_chunk(chunk_index: int, start: int, end: int):
+        chunk_ids = item_ids[start:end]
+        await batch_limiter.acquire()
+        retry_after = None
+        try:
+            with tracer.start_as_current_span("execute_batch_chunk") as span:
+                span.set_attribute("batch.operation", operation_name)
+                span.set_attribute("batch.category", category_pk)
+                span.set_attribute("batch.chunk.index", chunk_index)
+                span.set_attribute("batch.chunk.count", len(chunks))
+                span.set_attribute("batch.chunk.size", end - start)
+                span.set_attribute("batch.concurrency.limit", batch_limiter.limit)
+                try:
+                    with track_backend_call() as call:
+                        batch_results = await container.execute_item_batch(
+                            batch_operations=operations[start:end], partition_key=category_pk
+                        )
+                    retry_after = throttle_signal(call=call)
+                    span.set_attribute("batch.chunk.outcome", "succeeded")
+                    logger.info(
+                        "Batch %s chunk %d/%d for category '%s' succeeded (%d operations)",
+                        operation_name, chunk_index + 1, len(chunks), category_pk, end - start,
+                    )
+                    return ChunkOutcome(chunk_ids, batch_results)
+                except CosmosBatchOperationError as e:
+                    retry_after = throttle_signal(e)
+                    span.set_attribute("batch.chunk.outcome", "failed")
+                    span.set_attribute("error.status_code", e.status_code)
+                    logger.error(
+                        f"Cosmos DB Batch {operation_name.capitalize()} Error for category '{category_pk}' "
+                        f"(chunk {chunk_index + 1}/{len(chunks)}): "
+                        f"First failed op index: {e.error_index}. Msg: {str(e)}",
+                        exc_info=True,
+                    )
+                    # log errors for failed operations
+                    for i, op_response in enumerate(e.operation_responses):
+                        if i < len(chunk_ids) and op_response.get("statusCode", 200) >= 400:
+                            logger.error(
+                                f"  Failed {operations[start + i][0]} op in batch for item ID "
+                                f"'{chunk_ids[i]}': {op_response}"
+                            )
+                    return ChunkOutcome(chunk_ids, None, list(e.operation_responses), e.status_code)
+                except CosmosHttpResponseError as e_http:
+                    retry_after = throttle_signal(e_http)
+                    span.set_attribute("batch.chunk.outcome", "failed")
+                    span.set_attribute("error.status_code", e_http.status_code)
+                    logger.error(
+                        f"Cosmos DB HTTP error during batch {operation_name} for category "
+                        f"'{category_pk}' (chunk {chunk_index + 1}/{len(chunks)}): {e_http}",
+                        exc_info=True,
+                    )
+                    return ChunkOutcome(chunk_ids, None, status_code=e_http.status_code)
+                except Exception as e_generic:
+                    span.set_attribute("batch.chunk.outcome", "failed")
+                    span.set_attribute("error.type", type(e_generic).__name__)
+                    logger.error(
+                        f"Unexpected error during batch {operation_name} for category "
+                        f"'{category_pk}' (chunk {chunk_index + 1}/{len(chunks)}): {e_generic}",
+                        exc_info=True,
+                    )
+                    return ChunkOutcome(chunk_ids, None, status_code=500)
+        finally:
+            await batch_limiter.release(
+                throttled=retry_after is not None, retry_after_seconds=retry_after or 0.0
+            )
+
+    return await asyncio.gather(
+        *(run_chunk(index, start, end) for index, (start, end) in enumerate(chunks))
+    )
+
+
 async def create_products(
     container: ContainerProxy,
     batch_create: ProductBatchCreate,
@@ -63,14 +281,8 @@ async def create_products(
 
         # Add id, status, and last_updated to each product
         for product_to_create in product_list_for_category:
-            data = product_to_create.model_dump()
-            data["id"] = str(uuid.uuid4())
-            data["status"] = ProductStatus.ACTIVE.value
-            data["last_updated"] = datetime.now(timezone.utc).isoformat()
-            
-            # Normalize category for consistent storage
-            data["category"] = normalize_category(data["category"])
-            
+            data = _new_product_document(product_to_create)
+
             # Add all fields to the batch operation
             raw_product_data_in_batch.append(data)
             # Add operation for product creation to the batch
@@ -79,45 +291,29 @@ async def create_products(
         if not batch_operations_for_db:
             return []
 
-        try:
-            batch_results = await container.execute_item_batch(
-                batch_operations=batch_operations_for_db, partition_key=category_pk
-            )
-            for result_item in batch_results:
-                if isinstance(result_item, dict) and result_item.get("id"):
-                    successfully_created_products.append(
-                        ProductResponse.model_validate(result_item)
-                    )
+        chunk_outcomes = await _execute_in_chunks(
+            container,
+            category_pk,
+            batch_operations_for_db,
+            [data["id"] for data in raw_product_data_in_batch],
+            "create",
+        )
+        for outcome in chunk_outcomes:
+            if outcome.results is None:
+                continue
+            for result_item in outcome.results:
+                body = _result_body(result_item)
+                if body is not None:
+                    category_catalog.add(category_pk)
+                    category_stats_cache.invalidate(category_pk)
+                    product = _committed_product(body, "batch create")
+                    if product is not None:
+                        product_cache.put(product)
+                        successfully_created_products.append(product)
                 else:
                     logger.warning(
                         f"Unexpected item in successful batch create result for category '{category_pk}': {result_item}"
                     )
-        except CosmosBatchOperationError as e:
-            logger.error(
-                f"Cosmos DB Batch Create Error for category '{category_pk}': "
-                f"First failed op index: {e.error_index}. Msg: {str(e)}",
-                exc_info=True,
-            )
-            # log errors for failed operations
-            for i, op_response in enumerate(e.operation_responses):
-                if i < len(raw_product_data_in_batch):
-                    attempted_item_id = raw_product_data_in_batch[i].get(
-                        "id", "unknown_id"
-                    )
-                    if op_response.get("statusCode", 200) >= 400:
-                        logger.error(
-                            f"  Failed create op in batch for item ID '{attempted_item_id}': {op_response}"
-                        )
-        except CosmosHttpResponseError as e_http:
-            logger.error(
-                f"Cosmos DB HTTP error during batch create for category '{category_pk}': {e_http}",
-                exc_info=True,
-            )
-        except Exception as e_generic:
-            logger.error(
-                f"Unexpected error during batch create for category '{category_pk}': {e_generic}",
-                exc_info=True,
-            )
         return successfully_created_products
 
     # schedule tasks to run concurrently for each category
@@ -168,16 +364,7 @@ async def update_products(
         ids_in_current_batch_for_logging = []
 
         for update_item in update_items_for_category:
-            update_dict = update_item.changes.model_dump(exclude_unset=True)
-            
-            update_dict["last_updated"] = datetime.now(timezone.utc).isoformat()
-            
-            json_patch_operations = []
-            for key, value in update_dict.items():
-                if key not in ["id", "category", "_etag"]:
-                    json_patch_operations.append(
-                        {"op": "set", "path": f"/{key}", "value": value}
-                    )
+            json_patch_operations = update_patch_operations(update_item.changes)
 
             if not json_patch_operations:
                 logger.warning(
@@ -190,49 +377,38 @@ async def update_products(
                 (
                     "patch",
                     (update_item.id, json_patch_operations),
-                    {"if_match_etag": update_item.etag},
+                    {"if_match_etag": update_item.etag, "filter_predicate": product_filter_predicate()},
                 )
             )
 
         if not batch_operations_for_db:
             return []
 
-        try:
-            batch_results = await container.execute_item_batch(
-                batch_operations=batch_operations_for_db, partition_key=category_pk
-            )
-            for result_item in batch_results:
-                if isinstance(result_item, dict) and result_item.get("id"):
-                    successfully_updated_products.append(
-                        ProductResponse.model_validate(result_item)
-                    )
+        for product_id in ids_in_current_batch_for_logging:
+            product_cache.invalidate(category_pk, product_id)
+
+        chunk_outcomes = await _execute_in_chunks(
+            container,
+            category_pk,
+            batch_operations_for_db,
+            ids_in_current_batch_for_logging,
+            "update",
+        )
+        for outcome in chunk_outcomes:
+            if outcome.results is None:
+                continue
+            for result_item in outcome.results:
+                body = _result_body(result_item)
+                if body is not None:
+                    category_stats_cache.invalidate(category_pk)
+                    product = _committed_product(body, "batch update")
+                    if product is not None:
+                        product_cache.put(product)
+                        successfully_updated_products.append(product)
                 else:
                     logger.warning(
                         f"Unexpected item in successful batch update result for category '{category_pk}': {result_item}"
                     )
-        except CosmosBatchOperationError as e:
-            logger.error(
-                f"Cosmos DB Batch Update Error for category '{category_pk}': "
-                f"First failed op index: {e.error_index}. Msg: {str(e)}",
-                exc_info=True,
-            )
-            for i, op_response in enumerate(e.operation_responses):
-                if i < len(ids_in_current_batch_for_logging):
-                    attempted_item_id = ids_in_current_batch_for_logging[i]
-                    if op_response.get("statusCode", 200) >= 400:
-                        logger.error(
-                            f"  Failed patch op in batch for item ID '{attempted_item_id}': {op_response}"
-                        )
-        except CosmosHttpResponseError as e_http:
-            logger.error(
-                f"Cosmos DB HTTP error during batch update for category '{category_pk}': {e_http}",
-                exc_info=True,
-            )
-        except Exception as e_generic:
-            logger.error(
-                f"Unexpected error during batch update for category '{category_pk}': {e_generic}",
-                exc_info=True,
-            )
         
         return successfully_updated_products
 
@@ -279,41 +455,37 @@ async def delete_products(
             
         successfully_deleted_ids = []
         batch_operations_for_db: List[Tuple[str, Tuple[Any, ...], Dict[str, Any]]] = []
-        
+
+        skipped_ids = await _reservation_holds(container, category_pk, product_ids_in_category)
+        if skipped_ids:
+            logger.warning(
+                f"Skipping {len(skipped_ids)} IDs in category '{category_pk}' that are not products or could not be checked."
+            )
+            product_ids_in_category = [
+                product_id for product_id in product_ids_in_category if product_id not in skipped_ids
+            ]
+
         for product_id in product_ids_in_category:
             batch_operations_for_db.append(("delete", (product_id,), {}))
+            product_cache.invalidate(category_pk, product_id)
 
         if not batch_operations_for_db:
             return []
 
-        try:
-            await container.execute_item_batch(
-                batch_operations=batch_operations_for_db, partition_key=category_pk
-            )
-            successfully_deleted_ids.extend(product_ids_in_category)
-
-        except CosmosBatchOperationError as e:
-            logger.error(
-                f"Cosmos DB Batch Delete Error for category '{category_pk}': "
-                f"First failed op index: {e.error_index}. Msg: {str(e)}",
-                exc_info=True,
-            )
-            for i, op_response in enumerate(e.operation_responses):
-                if i < len(product_ids_in_category):
-                    attempted_item_id = product_ids_in_category[i]
-                    if op_response.get("statusCode", 200) >= 400:
-                        logger.error(
-                            f"  Failed delete op in batch for item ID '{attempted_item_id}': {op_response}"
-                        )
-        except CosmosHttpResponseError as e_http:
-            logger.error(
-                f"Cosmos DB HTTP error during batch delete for category '{category_pk}': {e_http}",
-                exc_info=True,
-            )
-        except Exception as e_generic:
-            logger.error(
-                f"Unexpected error during batch delete for category '{category_pk}': {e_generic}",
-                exc_info=True,
+        chunk_outcomes = await _execute_in_chunks(
+            container,
+            category_pk,
+            batch_operations_for_db,
+            product_ids_in_category,
+            "delete",
+        )
+        for outcome in chunk_outcomes:
+            if outcome.results is not None:
+                successfully_deleted_ids.extend(outcome.item_ids)
+        if successfully_deleted_ids:
+            category_stats_cache.invalidate(category_pk)
+            category_catalog.removed_from(
+                category_pk, lambda category: is_category_empty(container, category)
             )
         return successfully_deleted_ids
 
@@ -331,3 +503,360 @@ async def delete_products(
             all_successfully_deleted_ids.append(id)
     
     return all_successfully_deleted_ids
+
+
+_BULK_STATUS_BY_CODE = {
+    404: BulkItemStatus.NOT_FOUND,
+    409: BulkItemStatus.CONFLICT,
+    412: BulkItemStatus.PRECONDITION_FAILED,
+    429: BulkItemStatus.THROTTLED,
+}
+
+# What a client is told about a failed item; Cosmos DB's own message stays in the logs
+_BULK_ERROR_BY_CODE = {
+    404: "Product not found.",
+    409: "A product with this ID already exists.",
+    412: "The product was modified since it was read.",
+    429: "Request rate too large; retry later.",
+}
+
+
+def _hold_result(index: int, item_id: str) -> ProductBulkItemResult:
+    """Result for an item whose ID is a reservation hold: as far as clients know, no such product."""
+    return ProductBulkItemResult(
+        index=index,
+        id=item_id,
+        status=BulkItemStatus.NOT_FOUND,
+        status_code=404,
+        error=_BULK_ERROR_BY_CODE[404],
+    )
+
+
+async def _run_bulk(
+    operation_name: str,
+    item_ids: List[str],
+    run_item: Callable[[int], Awaitable[ProductBulkItemResult]],
+) -> ProductBulkResult:
+    """
+    Run one independent point operation per item, bounded by batch_limiter.
+
+    Args:
+        operation_name: Operation label for tracing and logs
+        item_ids: Product ID of each item in the request, in order
+        run_item: Coroutine function executing the item at an index
+
+    Returns:
+        Per-item results in request order plus throughput figures
+    """
+    with tracer.start_as_current_span(f"bulk_{operation_name}_products") as span:
+        item_count = len(item_ids)
+        throttles_before = batch_limiter.throttle_count
+
+        async def run_bounded(index: int) -> ProductBulkItemResult:
+            await batch_limiter.acquire()
+            retry_after = None
+            try:
+                with track_backend_call() as call:
+                    result = await run_item(index)
+                retry_after = throttle_signal(call=call)
+                return result
+            except CosmosHttpResponseError as e:
+                retry_after = throttle_signal(e)
+                logger.warning(
+                    "Cosmos DB error during bulk %s for item %d",
+                    operation_name,
+                    index,
+                    extra={"product_id": item_ids[index], "status_code": e.status_code, "error_message": e.message},
+                )
+                return ProductBulkItemResult(
+                    index=index,
+                    id=item_ids[index],
+                    status=_BULK_STATUS_BY_CODE.get(e.status_code, BulkItemStatus.FAILED),
+                    status_code=e.status_code or 500,
+                    error=_BULK_ERROR_BY_CODE.get(e.status_code, "A database error occurred."),
+                )
+            except Exception as e:
+                logger.error(
+                    f"Unexpected error during bulk {operation_name} for item {index}: {e}",
+                    exc_info=True,
+                )
+                return ProductBulkItemResult(
+                    index=index,
+                    id=item_ids[index],
+                    status=BulkItemStatus.FAILED,
+                    status_code=500,
+                    error="An unexpected error occurred during database operation.",
+                )
+            finally:
+                await batch_limiter.release(
+                    throttled=retry_after is not None, retry_after_seconds=retry_after or 0.0
+                )
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(run_bounded(index) for index in range(item_count)))
+        elapsed = time.perf_counter() - started
+
+        succeeded = sum(1 for result in results if result.status_code < 400)
+        items_per_second = item_count / elapsed if elapsed else 0.0
+
+        span.set_attribute("bulk.size", item_count)
+        span.set_attribute("bulk.succeeded", succeeded)
+        span.set_attribute("bulk.failed", item_count - succeeded)
+        span.set_attribute("bulk.throttled", sum(1 for r in results if r.status == BulkItemStatus.THROTTLED))
+        span.set_attribute("bulk.items_per_second", items_per_second)
+        span.set_attribute("bulk.concurrency.limit", batch_limiter.limit)
+        span.set_attribute("bulk.concurrency.throttles", batch_limiter.throttle_count - throttles_before)
+        logger.info(
+            "Bulk %s finished: %d/%d succeeded in %.3fs (%.1f items/s)",
+            operation_name, succeeded, item_count, elapsed, items_per_second,
+        )
+
+        return ProductBulkResult(
+            items=results,
+            succeeded=succeeded,
+            failed=item_count - succeeded,
+            elapsed_seconds=round(elapsed, 3),
+            items_per_second=round(items_per_second, 1),
+        )
+
+
+async def bulk_create_products(
+    container: ContainerProxy,
+    batch_create: ProductBatchCreate,
+) -> ProductBulkResult:
+    """
+    Create multiple products as independent point operations.
+
+    Unlike create_products, one failing item does not affect the others.
+
+    Args:
+        container: Cosmos DB container client
+        batch_create: Batch create request containing items to create
+
+    Returns:
+        Per-item results in request order
+    """
+    documents = [_new_product_document(product) for product in batch_create.items]
+
+    async def create_one(index: int) -> ProductBulkItemResult:
+        document = documents[index]
+        result = await container.create_item(body=document)
+        category_catalog.add(document["category"])
+        category_stats_cache.invalidate(document["category"])
+        product = _committed_product(result, "create")
+        if product is not None:
+            product_cache.put(product)
+        return ProductBulkItemResult(
+            index=index, id=document["id"], status=BulkItemStatus.CREATED, status_code=201, product=product
+        )
+
+    return await _run_bulk("create", [data["id"] for data in documents], create_one)
+
+
+async def bulk_update_products(
+    container: ContainerProxy,
+    batch_update: ProductBatchUpdate,
+) -> ProductBulkResult:
+    """
+    Update multiple products as independent point operations.
+
+    Each item is patched with its own ETag; a mismatch is reported for that
+    item only.
+
+    Args:
+        container: Cosmos DB container client
+        batch_update: Batch update request containing items to update
+
+    Returns:
+        Per-item results in request order
+    """
+    async def update_one(index: int) -> ProductBulkItemResult:
+        update_item = batch_update.items[index]
+        category_pk = normalize_category(update_item.category)
+        product_cache.invalidate(category_pk, update_item.id)
+        try:
+            result = await container.patch_item(
+                item=update_item.id,
+                partition_key=category_pk,
+                patch_operations=update_patch_operations(update_item.changes),
+                filter_predicate=product_filter_predicate(),
+                headers={"if-match": update_item.etag},
+            )
+        except CosmosHttpResponseError as e:
+            if e.status_code == 412 and await is_reservation_hold(container, update_item.id, category_pk):
+                return _hold_result(index, update_item.id)
+            raise
+        category_stats_cache.invalidate(category_pk)
+        product = _committed_product(result, "update")
+        if product is not None:
+            product_cache.put(product)
+        return ProductBulkItemResult(
+            index=index, id=update_item.id, status=BulkItemStatus.UPDATED, status_code=200, product=product
+        )
+
+    return await _run_bulk("update", [item.id for item in batch_update.items], update_one)
+
+
+async def bulk_delete_products(
+    container: ContainerProxy,
+    batch_delete: ProductBatchDelete,
+) -> ProductBulkResult:
+    """
+    Delete multiple products as independent point operations.
+
+    Args:
+        container: Cosmos DB container client
+        batch_delete: Batch delete request containing items to delete
+
+    Returns:
+        Per-item results in request order
+    """
+    async def delete_one(index: int) -> ProductBulkItemResult:
+        delete_item = batch_delete.items[index]
+        category_pk = normalize_category(delete_item.category)
+        product_cache.invalidate(category_pk, delete_item.id)
+        # Deletes take no filter predicate, so holds are turned away up front
+        if await is_reservation_hold(container, delete_item.id, category_pk):
+            return _hold_result(index, delete_item.id)
+        await container.delete_item(item=delete_item.id, partition_key=category_pk)
+        category_stats_cache.invalidate(category_pk)
+        return ProductBulkItemResult(
+            index=index, id=delete_item.id, status=BulkItemStatus.DELETED, status_code=204
+        )
+
+    result = await _run_bulk("delete", [item.id for item in batch_delete.items], delete_one)
+    # Check each affected category once, after all its deletes have finished
+    for category_pk in {
+        normalize_category(batch_delete.items[item.index].category)
+        for item in result.items
+        if item.status == BulkItemStatus.DELETED
+    }:
+        category_catalog.removed_from(
+            category_pk, lambda category: is_category_empty(container, category)
+        )
+    return result
+
+
+_STOCK_STATUS_BY_CODE = {
+    404: BulkItemStatus.NOT_FOUND,
+    412: BulkItemStatus.INSUFFICIENT_STOCK,  # Filter predicate not satisfied
+    424: BulkItemStatus.ROLLED_BACK,  # Failed dependency: another op in the batch failed
+    429: BulkItemStatus.THROTTLED,
+}
+
+
+async def adjust_products_stock(
+    container: ContainerProxy,
+    batch_stock: ProductBatchStock,
+) -> ProductBulkResult:
+    """
+    Apply stock adjustments for many products, one transactional batch per category.
+
+    Each line is an "incr" patch guarded by its quantity predicate (no
+    negative stock by default), so a whole order commits in one round trip
+    per category. If any line of a category fails, that category's batch is
+    rolled back and its other lines are reported as rolled_back. Categories
+    with more than 100 lines are split into batches that commit separately.
+
+    Args:
+        container: Cosmos DB container client
+        batch_stock: Stock adjustment lines
+
+    Returns:
+        Per-line results in request order
+    """
+    if any(item.delta == 0 for item in batch_stock.items):
+        raise ValueError("delta must not be zero.")
+
+    lines_by_category: Dict[str, List[Tuple[int, ProductBatchStockItem]]] = defaultdict(list)
+    for index, item in enumerate(batch_stock.items):
+        lines_by_category[normalize_category(item.category)].append((index, item))
+
+    results: List[Optional[ProductBulkItemResult]] = [None] * len(batch_stock.items)
+
+    async def process_category_stock(category_pk, lines):
+        batch_operations_for_db: List[BatchOperation] = []
+        for _, item in lines:
+            batch_operations_for_db.append(
+                (
+                    "patch",
+                    (item.id, stock_patch_operations(item.delta)),
+                    {"filter_predicate": stock_filter_predicate(item)},
+                )
+            )
+            product_cache.invalidate(category_pk, item.id)
+
+        chunk_outcomes = await _execute_in_chunks(
+            container,
+            category_pk,
+            batch_operations_for_db,
+            [item.id for _, item in lines],
+            "stock",
+        )
+        position = 0
+        for outcome in chunk_outcomes:
+            chunk_lines = lines[position:position + len(outcome.item_ids)]
+            position += len(outcome.item_ids)
+            if outcome.results is not None:
+                category_stats_cache.invalidate(category_pk)
+            for offset, (index, item) in enumerate(chunk_lines):
+                if outcome.results is not None:
+                    body = _result_body(outcome.results[offset])
+                    product = _committed_product(body, "stock adjustment") if body else None
+                    if product is not None:
+                        product_cache.put(product)
+                    results[index] = ProductBulkItemResult(
+                        index=index, id=item.id, status=BulkItemStatus.UPDATED, status_code=200, product=product
+                    )
+                    continue
+                responses = outcome.error_responses or []
+                status_code = (
+                    responses[offset].get("statusCode", outcome.status_code)
+                    if offset < len(responses)
+                    else outcome.status_code
+                ) or 500
+                if status_code == 412:
+                    # The predicate also refuses reservation holds; those are reported as not found
+                    try:
+                        if await is_reservation_hold(container, item.id, category_pk):
+                            status_code = 404
+                    except CosmosHttpResponseError:
+                        pass
+                results[index] = ProductBulkItemResult(
+                    index=index,
+                    id=item.id,
+                    status=_STOCK_STATUS_BY_CODE.get(status_code, BulkItemStatus.FAILED),
+                    status_code=status_code,
+                    error=(
+                        "Insufficient stock for the requested change."
+                        if status_code == 412
+                        else None
+                    ),
+                )
+
+    with tracer.start_as_current_span("adjust_products_stock") as span:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(process_category_stock(category, lines) for category, lines in lines_by_category.items())
+        )
+        elapsed = time.perf_counter() - started
+
+        item_count = len(results)
+        succeeded = sum(1 for result in results if result.status_code < 400)
+        items_per_second = item_count / elapsed if elapsed else 0.0
+        span.set_attribute("stock.lines", item_count)
+        span.set_attribute("stock.categories", len(lines_by_category))
+        span.set_attribute("stock.succeeded", succeeded)
+        span.set_attribute("stock.failed", item_count - succeeded)
+        logger.info(
+            "Batch stock adjustment finished: %d/%d lines applied across %d categories",
+            succeeded, item_count, len(lines_by_category),
+        )
+
+        return ProductBulkResult(
+            items=results,
+            succeeded=succeeded,
+            failed=item_count - succeeded,
+            elapsed_seconds=round(elapsed, 3),
+            items_per_second=round(items_per_second, 1),
+        )
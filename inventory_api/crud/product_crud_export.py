@@ -0,0 +1,255 @@
+import asyncio
+import time
+import zlib
+from typing import Any, AsyncIterator, Dict, Optional
+
+import orjson
+from azure.cosmos.exceptions import CosmosHttpResponseError
+from azure.cosmos.aio import ContainerProxy
+
+from inventory_api.crud.product_crud import PRODUCT_DOCUMENTS_FILTER, normalize_category
+from inventory_api.exceptions import DatabaseError
+from inventory_api.logging_config import get_child_logger, tracer
+
+# Create a child logger for this module
+logger = get_child_logger("crud.product_export")
+
+# Cosmos DB system properties left out of exported documents (_etag is kept)
+SYSTEM_PROPERTIES = ("_rid", "_self", "_attachments", "_ts")
+
+
+def to_ndjson_line(document: Dict[str, Any]) -> bytes:
+    """Serialize a stored product document as one NDJSON line."""
+    exported = {key: value for key, value in document.items() if key not in SYSTEM_PROPERTIES}
+    return orjson.dumps(exported) + b"\n"
+
+
+async def export_products(
+    container: ContainerProxy,
+    category: str,
+    page_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """
+    Stream every product in a category as NDJSON, one chunk per page.
+
+    Documents are serialized straight from the query pages without model
+    validation, so memory stays bounded by a single page.
+
+    Args:
+        container: Cosmos DB container client
+        category: Category to export (partition key)
+        page_size: Maximum documents per Cosmos DB page
+
+    Yields:
+        NDJSON-encoded chunks
+
+    Raises:
+        DatabaseError: If a database operation fails
+    """
+    normalized_category = normalize_category(category)
+    # A plain span, not the current one: the generator is resumed in other contexts
+    span = tracer.start_span("export_products")
+    span.set_attribute("category", normalized_category)
+    span.set_attribute("page_size", page_size)
+
+    exported = 0
+    try:
+        query_iterator = container.query_items(
+            query=f"SELECT * FROM c WHERE c.category = @category AND {PRODUCT_DOCUMENTS_FILTER}",
+            parameters=[{"name": "@category", "value": normalized_category}],
+            partition_key=normalized_category,
+            max_item_count=page_size,
+        )
+        async for page in query_iterator.by_page():
+            chunk = bytearray()
+            async for item in page:
+                chunk += to_ndjson_line(item)
+                exported += 1
+            if chunk:
+                yield bytes(chunk)
+
+        logger.info(
+            "Exported products",
+            extra={"category": normalized_category, "count": exported},
+        )
+    except CosmosHttpResponseError as e:
+        span.set_attribute("error", True)
+        span.set_attribute("error.type", "cosmos_http_error")
+        span.set_attribute("error.status_code", e.status_code)
+
+        logger.error(
+            "Cosmos DB error during product export",
+            extra={"status_code": e.status_code, "category": normalized_category},
+            exc_info=True,
+        )
+        raise DatabaseError(
+            f"Cosmos DB error during product export: Status Code {e.status_code}, Message: {e.message}",
+            original_exception=e,
+        ) from e
+    except Exception as e:
+        span.set_attribute("error", True)
+        span.set_attribute("error.type", type(e).__name__)
+
+        logger.error(
+            "Unexpected error during product export",
+            extra={"error_type": type(e).__name__, "category": normalized_category},
+            exc_info=True,
+        )
+        raise DatabaseError(
+            "An unexpected error occurred during database operation.",
+            original_exception=e,
+        ) from e
+    finally:
+        span.set_attribute("products.count", exported)
+        span.end()
+
+
+class ExportStats:
+    """Running totals for a catalog export, reported when it finishes."""
+
+    def __init__(self):
+        self.items = 0
+        self.request_charge = 0.0
+        self.feed_ranges = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def capture_request_charge(self, headers, _) -> None:
+        """Cosmos DB response_hook adding each page's RU charge."""
+        self.request_charge += float(headers.get("x-ms-request-charge", 0))
+
+    def as_dict(self) -> Dict[str, float]:
+        elapsed = self.elapsed or time.perf_counter() - self.started
+        return {
+            "items": self.items,
+            "feed_ranges": self.feed_ranges,
+            "elapsed_seconds": round(elapsed, 3),
+            "request_charge": round(self.request_charge, 2),
+            "items_per_second": round(self.items / elapsed, 1) if elapsed else 0.0,
+            "ru_per_second": round(self.request_charge / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+# Marks the end of one feed range's output on the shared queue
+_RANGE_DONE = object()
+
+
+async def export_catalog(
+    container: ContainerProxy,
+    parallelism: int = 4,
+    page_size: int = 1000,
+    compress: bool = False,
+    stats: Optional[ExportStats] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Stream the whole container as NDJSON, reading feed ranges concurrently.
+
+    Each feed range is read by its own task, at most ``parallelism`` at a
+    time, and pages are merged in arrival order through a bounded queue, so
+    memory stays at a few pages however large the container is. Output can
+    be gzip-compressed on the fly.
+
+    Args:
+        container: Cosmos DB container client
+        parallelism: Maximum feed ranges read concurrently
+        page_size: Maximum documents per Cosmos DB page
+        compress: Gzip-compress the NDJSON stream
+        stats: Optional ExportStats filled in as the export runs
+
+    Yields:
+        NDJSON (or gzip) chunks
+
+    Raises:
+        DatabaseError: If a database operation fails
+    """
+    stats = stats or ExportStats()
+    span = tracer.start_span("export_catalog")
+    span.set_attribute("parallelism", parallelism)
+    span.set_attribute("page_size", page_size)
+    span.set_attribute("compress", compress)
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=parallelism * 2)
+    semaphore = asyncio.Semaphore(parallelism)
+    compressor = zlib.compressobj(wbits=31) if compress else None  # 31 = gzip container
+    tasks = []
+
+    async def read_feed_range(feed_range: Dict[str, Any]) -> None:
+        try:
+            async with semaphore:
+                query_iterator = container.query_items(
+                    query=f"SELECT * FROM c WHERE {PRODUCT_DOCUMENTS_FILTER}",
+                    feed_range=feed_range,
+                    max_item_count=page_size,
+                    response_hook=stats.capture_request_charge,
+                )
+                async for page in query_iterator.by_page():
+                    chunk = bytearray()
+                    count = 0
+                    async for item in page:
+                        chunk += to_ndjson_line(item)
+                        count += 1
+                    if chunk:
+                        await queue.put((bytes(chunk), count))
+            await queue.put(_RANGE_DONE)
+        except Exception as e:
+            await queue.put(e)
+
+    try:
+        feed_ranges = [feed_range async for feed_range in container.read_feed_ranges()]
+        stats.feed_ranges = len(feed_ranges)
+        tasks = [asyncio.create_task(read_feed_range(fr)) for fr in feed_ranges]
+
+        remaining = len(tasks)
+        while remaining:
+            entry = await queue.get()
+            if entry is _RANGE_DONE:
+                remaining -= 1
+                continue
+            if isinstance(entry, Exception):
+                raise entry
+            chunk, count = entry
+            stats.items += count
+            if compressor:
+                chunk = compressor.compress(chunk)
+                if not chunk:
+                    continue
+            yield chunk
+
+        if compressor:
+            yield compressor.flush()
+
+        stats.elapsed = time.perf_counter() - stats.started
+        span.set_attributes({f"export.{key}": value for key, value in stats.as_dict().items()})
+        logger.info("Exported catalog", extra=stats.as_dict())
+    except CosmosHttpResponseError as e:
+        span.set_attribute("error", True)
+        span.set_attribute("error.type", "cosmos_http_error")
+        span.set_attribute("error.status_code", e.status_code)
+
+        logger.error(
+            "Cosmos DB error during catalog export",
+            extra={"status_code": e.status_code},
+            exc_info=True,
+        )
+        raise DatabaseError(
+            f"Cosmos DB error during catalog export: Status Code {e.status_code}, Message: {e.message}",
+            original_exception=e,
+        ) from e
+    except Exception as e:
+        span.set_attribute("error", True)
+        span.set_attribute("error.type", type(e).__name__)
+
+        logger.error(
+            "Unexpected error during catalog export",
+            extra={"error_type": type(e).__name__},
+            exc_info=True,
+        )
+        raise DatabaseError(
+            "An unexpected error occurred during database operation.",
+            original_exception=e,
+        ) from e
+    finally:
+        # Stop any readers still running if the consumer went away or failed
+        for task in tasks:
+            task.cancel()
+        span.end()
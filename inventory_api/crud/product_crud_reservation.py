@@ -0,0 +1,336 @@
+import os
+import time
+import uuid
+from typing import Any, Dict
+
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import CosmosBatchOperationError, CosmosHttpResponseError
+from azure.cosmos.aio import ContainerProxy
+
+from inventory_api.cache import category_stats_cache, product_cache
+from inventory_api.crud.product_crud import (
+    is_reservation_hold,
+    normalize_category,
+    stock_filter_predicate,
+    stock_patch_operations,
+)
+from inventory_api.exceptions import (
+    DatabaseError,
+    ProductNotFoundError,
+    ReservationExpiredError,
+    ReservationNotFoundError,
+    StockConditionFailedError,
+)
+from inventory_api.logging_config import get_child_logger, tracer
+from inventory_api.models.product import StockAdjustment
+from inventory_api.models.reservation import (
+    RESERVATION_DOCUMENT_TYPE,
+    ReservationCreate,
+    ReservationResponse,
+    ReservationStatus,
+)
+
+# Create a child logger for this module
+logger = get_child_logger("crud.product_reservation")
+
+# How long a hold sets stock aside unless the request asks otherwise
+RESERVATION_HOLD_SECONDS = int(os.environ.get("RESERVATION_HOLD_SECONDS", "900"))
+# Extra lifetime of a hold document past its expiry, giving the expiry sweep
+# time to return its stock before Cosmos DB's TTL deletes it
+RESERVATION_CLEANUP_GRACE_SECONDS = int(
+    os.environ.get("RESERVATION_CLEANUP_GRACE_SECONDS", "86400")
+)
+
+
+def _reservation_response(hold: Dict[str, Any], status: ReservationStatus) -> ReservationResponse:
+    return ReservationResponse.model_validate({**hold, "status": status.value})
+
+
+def _stock_changed(category: str, product_id: str) -> None:
+    product_cache.invalidate(category, product_id)
+    category_stats_cache.invalidate(category)
+
+
+async def _read_hold(container: ContainerProxy, reservation_id: str, category: str) -> Dict[str, Any]:
+    try:
+        hold = await container.read_item(item=reservation_id, partition_key=category)
+    except CosmosHttpResponseError as e:
+        if e.status_code == 404:
+            raise ReservationNotFoundError(
+                f"Reservation '{reservation_id}' not found or already settled"
+            ) from e
+        raise
+    if hold.get("type") != RESERVATION_DOCUMENT_TYPE:
+        raise ReservationNotFoundError(f"Reservation '{reservation_id}' not found or already settled")
+    return hold
+
+
+async def _return_held_stock(container: ContainerProxy, hold: Dict[str, Any]) -> None:
+    """
+    Delete a hold and give its quantity back to the product in one transactional batch.
+
+    The delete is conditional on the hold's ETag, so a hold settled
+    concurrently (confirm, release or the expiry sweep) is never returned twice.
+    """
+    category = hold["category"]
+    batch_operations = [
+        ("delete", (hold["id"],), {"if_match_etag": hold["_etag"]}),
+        ("patch", (hold["product_id"], stock_patch_operations(hold["quantity"])), {}),
+    ]
+    try:
+        await container.execute_item_batch(batch_operations=batch_operations, partition_key=category)
+    except CosmosBatchOperationError as e:
+        statuses = [response.get("statusCode") for response in e.operation_responses]
+        if statuses and statuses[0] in (404, 412):
+            raise ReservationNotFoundError(
+                f"Reservation '{hold['id']}' not found or already settled"
+            ) from e
+        if len(statuses) > 1 and statuses[1] == 404:
+            # The product is gone, so there is nothing to return the stock to
+            await container.delete_item(
+                item=hold["id"],
+                partition_key=category,
+                etag=hold["_etag"],
+                match_condition=MatchConditions.IfNotModified,
+            )
+            return
+        raise
+    _stock_changed(category, hold["product_id"])
+
+
+async def create_reservation(
+    container: ContainerProxy, reservation: ReservationCreate
+) -> ReservationResponse:
+    """
+    Hold stock for a product until the hold is confirmed, released or expires.
+
+    The product's quantity is decremented (never below zero) and the hold
+    document created in the same transactional batch, so the available
+    quantity and the outstanding holds always agree.
+
+    Args:
+        container: Cosmos DB container client
+        reservation: Product, quantity and optional hold duration
+
+    Returns:
+        The new reservation
+
+    Raises:
+        ProductNotFoundError: If the product doesn't exist
+        StockConditionFailedError: If there is not enough stock to hold
+        DatabaseError: If a database operation fails
+    """
+    if reservation.quantity <= 0:
+        raise ValueError("quantity must be positive.")
+    hold_seconds = reservation.hold_seconds or RESERVATION_HOLD_SECONDS
+    if hold_seconds <= 0:
+        raise ValueError("hold_seconds must be positive.")
+
+    category = normalize_category(reservation.category)
+    hold = {
+        "id": f"hold-{uuid.uuid4()}",
+        "type": RESERVATION_DOCUMENT_TYPE,
+        "product_id": reservation.product_id,
+        "category": category,
+        "quantity": reservation.quantity,
+        "expires_at": time.time() + hold_seconds,
+        # Cosmos DB deletes the document on its own once this lapses
+        "ttl": hold_seconds + RESERVATION_CLEANUP_GRACE_SECONDS,
+    }
+    adjustment = StockAdjustment(delta=-reservation.quantity)
+
+    with tracer.start_as_current_span("create_reservation") as span:
+        span.set_attribute("product.id", reservation.product_id)
+        span.set_attribute("product.category", category)
+        span.set_attribute("reservation.id", hold["id"])
+        span.set_attribute("reservation.quantity", reservation.quantity)
+
+        batch_operations = [
+            (
+                "patch",
+                (reservation.product_id, stock_patch_operations(adjustment.delta)),
+                {"filter_predicate": stock_filter_predicate(adjustment)},
+            ),
+            ("create", (hold,), {}),
+        ]
+        try:
+            results = await container.execute_item_batch(
+                batch_operations=batch_operations, partition_key=category
+            )
+            _stock_changed(category, reservation.product_id)
+            logger.info(
+                "Reservation created",
+                extra={"reservation_id": hold["id"], "product_id": reservation.product_id, "category": category},
+            )
+            return _reservation_response(results[1]["resourceBody"], ReservationStatus.HELD)
+        except CosmosBatchOperationError as e:
+            span.set_attribute("error", True)
+            span.set_attribute("error.type", "cosmos_batch_error")
+            product_status = e.operation_responses[0].get("statusCode") if e.operation_responses else None
+            if product_status == 404 or (
+                product_status == 412 and await is_reservation_hold(container, reservation.product_id, category)
+            ):
+                raise ProductNotFoundError(
+                    f"Product with ID '{reservation.product_id}' and category '{reservation.category}' not found"
+                ) from e
+            if product_status == 412:
+                raise StockConditionFailedError(
+                    f"Insufficient stock for product '{reservation.product_id}' to hold {reservation.quantity}."
+                ) from e
+            logger.error(f"Cosmos DB batch error creating reservation: {e}", exc_info=True)
+            raise DatabaseError(
+                f"Cosmos DB error creating reservation: Status Code {e.status_code}",
+                original_exception=e,
+            ) from e
+        except CosmosHttpResponseError as e:
+            span.set_attribute("error", True)
+            span.set_attribute("error.type", "cosmos_http_error")
+            span.set_attribute("error.status_code", e.status_code)
+            logger.error(
+                f"Cosmos DB error creating reservation: Status Code {e.status_code}, Message: {e.message}",
+                exc_info=True,
+            )
+            raise DatabaseError(
+                f"Cosmos DB error creating reservation: Status Code {e.status_code}, Message: {e.message}",
+                original_exception=e,
+            ) from e
+        except Exception as e:
+            span.set_attribute("error", True)
+            span.set_attribute("error.type", type(e).__name__)
+            logger.error(f"Unexpected error creating reservation: {e}", exc_info=True)
+            raise DatabaseError(
+                "An unexpected error occurred during database operation.",
+                original_exception=e,
+            ) from e
+
+
+async def confirm_reservation(
+    container: ContainerProxy, reservation_id: str, category: str
+) -> ReservationResponse:
+    """
+    Confirm a hold: its stock stays deducted and the hold is removed.
+
+    Raises:
+        ReservationNotFoundError: If the hold doesn't exist or was already settled
+        ReservationExpiredError: If the hold lapsed (its stock is returned)
+        DatabaseError: If a database operation fails
+    """
+    category = normalize_category(category)
+    with tracer.start_as_current_span("confirm_reservation") as span:
+        span.set_attribute("reservation.id", reservation_id)
+        span.set_attribute("product.category", category)
+        try:
+            hold = await _read_hold(container, reservation_id, category)
+            if hold["expires_at"] <= time.time():
+                await _return_held_stock(container, hold)
+                raise ReservationExpiredError(f"Reservation '{reservation_id}' has expired")
+            await container.delete_item(
+                item=reservation_id,
+                partition_key=category,
+                etag=hold["_etag"],
+                match_condition=MatchConditions.IfNotModified,
+            )
+            logger.info("Reservation confirmed", extra={"reservation_id": reservation_id, "category": category})
+            return _reservation_response(hold, ReservationStatus.CONFIRMED)
+        except (ReservationNotFoundError, ReservationExpiredError):
+            raise
+        except CosmosHttpResponseError as e:
+            if e.status_code in (404, 412):
+                raise ReservationNotFoundError(
+                    f"Reservation '{reservation_id}' not found or already settled"
+                ) from e
+            span.set_attribute("error", True)
+            span.set_attribute("error.status_code", e.status_code)
+            logger.error(
+                f"Cosmos DB error confirming reservation: Status Code {e.status_code}, Message: {e.message}",
+                exc_info=True,
+            )
+            raise DatabaseError(
+                f"Cosmos DB error confirming reservation: Status Code {e.status_code}, Message: {e.message}",
+                original_exception=e,
+            ) from e
+        except Exception as e:
+            span.set_attribute("error", True)
+            span.set_attribute("error.type", type(e).__name__)
+            logger.error(f"Unexpected error confirming reservation: {e}", exc_info=True)
+            raise DatabaseError(
+                "An unexpected error occurred during database operation.",
+                original_exception=e,
+            ) from e
+
+
+async def release_reservation(
+    container: ContainerProxy, reservation_id: str, category: str
+) -> ReservationResponse:
+    """
+    Cancel a hold and return its stock to the product.
+
+    Raises:
+        ReservationNotFoundError: If the hold doesn't exist or was already settled
+        DatabaseError: If a database operation fails
+    """
+    category = normalize_category(category)
+    with tracer.start_as_current_span("release_reservation") as span:
+        span.set_attribute("reservation.id", reservation_id)
+        span.set_attribute("product.category", category)
+        try:
+            hold = await _read_hold(container, reservation_id, category)
+            await _return_held_stock(container, hold)
+            logger.info("Reservation released", extra={"reservation_id": reservation_id, "category": category})
+            return _reservation_response(hold, ReservationStatus.RELEASED)
+        except ReservationNotFoundError:
+            raise
+        except (CosmosHttpResponseError, CosmosBatchOperationError) as e:
+            span.set_attribute("error", True)
+            span.set_attribute("error.status_code", e.status_code)
+            logger.error(f"Cosmos DB error releasing reservation: {e}", exc_info=True)
+            raise DatabaseError(
+                f"Cosmos DB error releasing reservation: Status Code {e.status_code}",
+                original_exception=e,
+            ) from e
+        except Exception as e:
+            span.set_attribute("error", True)
+            span.set_attribute("error.type", type(e).__name__)
+            logger.error(f"Unexpected error releasing reservation: {e}", exc_info=True)
+            raise DatabaseError(
+                "An unexpected error occurred during database operation.",
+                original_exception=e,
+            ) from e
+
+
+async def release_expired_reservations(container: ContainerProxy) -> int:
+    """
+    Return the stock of every lapsed hold. Run periodically by the expiry sweep.
+
+    Returns:
+        Number of holds released
+    """
+    with tracer.start_as_current_span("release_expired_reservations") as span:
+        query_iterator = container.query_items(
+            query="SELECT * FROM c WHERE c.type = @type AND c.expires_at <= @now",
+            parameters=[
+                {"name": "@type", "value": RESERVATION_DOCUMENT_TYPE},
+                {"name": "@now", "value": time.time()},
+            ],
+        )
+        released = 0
+        failed = 0
+        async for hold in query_iterator:
+            try:
+                await _return_held_stock(container, hold)
+                released += 1
+            except ReservationNotFoundError:
+                # Settled by a client between the query and the release
+                continue
+            except Exception as e:
+                failed += 1
+                logger.warning(
+                    f"Failed to release expired reservation '{hold['id']}': {e}",
+                    extra={"error_type": type(e).__name__},
+                    exc_info=True,
+                )
+        span.set_attribute("reservations.released", released)
+        span.set_attribute("reservations.failed", failed)
+        if released or failed:
+            logger.info("Expired reservations released: %d, failed: %d", released, failed)
+        return released
@@ -0,0 +1,130 @@
+import asyncio
+from typing import List, Optional
+
+from azure.cosmos.exceptions import CosmosHttpResponseError
+from azure.cosmos.aio import ContainerProxy
+
+from inventory_api.cache import category_stats_cache
+from inventory_api.crud.product_crud import PRODUCT_DOCUMENTS_FILTER, list_categories, normalize_category
+from inventory_api.exceptions import DatabaseError
+from inventory_api.logging_config import get_child_logger, tracer
+from inventory_api.models.product import CategoryStats, ProductStats
+
+# Create a child logger for this module
+logger = get_child_logger("crud.product_stats")
+
+# Single-partition aggregate, so the cost depends on one category's size only
+CATEGORY_STATS_QUERY = (
+    "SELECT COUNT(1) AS product_count, SUM(c.quantity) AS total_quantity, "
+    f"SUM(c.price * c.quantity) AS total_value FROM c WHERE {PRODUCT_DOCUMENTS_FILTER}"
+)
+
+# Maximum category aggregates computed concurrently per stats request
+STATS_QUERY_CONCURRENCY = 8
+
+
+async def get_category_stats(container: ContainerProxy, category: str) -> CategoryStats:
+    """
+    Return the inventory totals of one category, from cache when possible.
+
+    Args:
+        container: Cosmos DB container client
+        category: Normalized category (partition key)
+
+    Returns:
+        Product count, total quantity and total stock value of the category
+    """
+    cached = category_stats_cache.lookup(category)
+    if cached is not None:
+        return cached
+
+    version = category_stats_cache.version(category)
+    query_iterator = container.query_items(query=CATEGORY_STATS_QUERY, partition_key=category)
+    row = {}
+    async for item in query_iterator:
+        row = item
+    # SUM over no documents is undefined, so the property is simply absent
+    stats = CategoryStats(
+        category=category,
+        product_count=row.get("product_count", 0),
+        total_quantity=row.get("total_quantity", 0),
+        total_value=round(row.get("total_value", 0.0), 2),
+    )
+    category_stats_cache.put(stats, version)
+    return stats
+
+
+async def get_product_stats(
+    container: ContainerProxy, category: Optional[str] = None
+) -> ProductStats:
+    """
+    Summarize inventory per category.
+
+    Categories come from the category catalog and each one's totals from a
+    cached single-partition aggregate, so only categories written since the
+    last call (or past the cache TTL) are queried.
+
+    Args:
+        container: Cosmos DB container client
+        category: Restrict the result to one category
+
+    Returns:
+        Per-category totals and the overall totals
+
+    Raises:
+        DatabaseError: If a database operation fails
+    """
+    with tracer.start_as_current_span("get_product_stats") as span:
+        span.set_attribute("category", category or "*")
+        try:
+            if category is not None:
+                categories = [normalize_category(category)]
+            else:
+                categories = await list_categories(container)
+
+            semaphore = asyncio.Semaphore(STATS_QUERY_CONCURRENCY)
+
+            async def bounded(category_pk: str) -> CategoryStats:
+                async with semaphore:
+                    return await get_category_stats(container, category_pk)
+
+            results: List[CategoryStats] = await asyncio.gather(
+                *(bounded(category_pk) for category_pk in categories)
+            )
+            span.set_attribute("categories.count", len(results))
+            span.set_attributes(category_stats_cache.stats())
+            return ProductStats(
+                categories=results,
+                product_count=sum(stats.product_count for stats in results),
+                total_quantity=sum(stats.total_quantity for stats in results),
+                total_value=round(sum(stats.total_value for stats in results), 2),
+            )
+        except DatabaseError:
+            raise
+        except CosmosHttpResponseError as e:
+            span.set_attribute("error", True)
+            span.set_attribute("error.type", "cosmos_http_error")
+            span.set_attribute("error.status_code", e.status_code)
+
+            logger.error(
+                "Cosmos DB error computing product stats",
+                extra={"status_code": e.status_code, "category": category},
+                exc_info=True,
+            )
+            raise DatabaseError(
+                f"Cosmos DB error computing product stats: Status Code {e.status_code}, Message: {e.message}",
+                original_exception=e,
+            ) from e
+        except Exception as e:
+            span.set_attribute("error", True)
+            span.set_attribute("error.type", type(e).__name__)
+
+            logger.error(
+                "Unexpected error computing product stats",
+                extra={"error_type": type(e).__name__, "category": category},
+                exc_info=True,
+            )
+            raise DatabaseError(
+                "An unexpected error occurred during database operation.",
+                original_exception=e,
+            ) from e
@@ -1,38 +1,204 @@
-from typing import Optional
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
 from azure.cosmos.aio import CosmosClient, ContainerProxy
 from azure.identity.aio import DefaultAzureCredential
 import os
 
 from enum import Enum
 
+from inventory_api.memory_backend import InMemoryContainerProxy
+from inventory_api.request_metrics import on_pipeline_request, on_pipeline_response
+
 class ContainerType(str, Enum):
     PRODUCTS = "products" 
 
 _client: Optional[CosmosClient] = None
 _credential: Optional[DefaultAzureCredential] = None
+_session: Optional[aiohttp.ClientSession] = None
+
+# Registry of container proxies and their properties, built once per worker
+_containers: Dict[ContainerType, ContainerProxy] = {}
+_container_properties: Dict[ContainerType, Dict[str, Any]] = {}
+
+# Environment variable naming each container; read when the container is first resolved
+CONTAINER_SETTINGS = {
+    ContainerType.PRODUCTS: "COSMOSDB_CONTAINER_PRODUCTS",
+}
+
+
+def _require_env(name: str) -> str:
+    value = os.environ.get(name)
+    if not value:
+        raise ValueError(f"Environment variable '{name}' is not set.")
+    return value
 
-COSMOSDB_ENDPOINT = os.environ["COSMOSDB_ENDPOINT"]
-DATABASE_NAME = os.environ["COSMOSDB_DATABASE"]
-CONTAINERS = {
-    "products": os.environ["COSMOSDB_CONTAINER_PRODUCTS"],
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.environ.get(name)
+    return float(value) if value else None
+
+def _env_bool(name: str) -> Optional[bool]:
+    value = os.environ.get(name)
+    return value.strip().lower() in ("1", "true", "yes") if value else None
+
+def _env_list(name: str) -> Optional[list[str]]:
+    value = os.environ.get(name)
+    return [item.strip() for item in value.split(",") if item.strip()] if value else None
+
+# Optional transport tuning; unset values keep the aiohttp / SDK defaults
+POOL_LIMIT = _env_int("COSMOSDB_POOL_LIMIT")
+POOL_LIMIT_PER_HOST = _env_int("COSMOSDB_POOL_LIMIT_PER_HOST")
+KEEPALIVE_TIMEOUT = _env_float("COSMOSDB_KEEPALIVE_TIMEOUT")
+CLIENT_OPTIONS = {
+    "connection_timeout": _env_float("COSMOSDB_CONNECTION_TIMEOUT"),
+    "read_timeout": _env_float("COSMOSDB_READ_TIMEOUT"),
+    "preferred_locations": _env_list("COSMOSDB_PREFERRED_LOCATIONS"),
+    "retry_total": _env_int("COSMOSDB_RETRY_TOTAL"),
+    "retry_backoff_max": _env_int("COSMOSDB_RETRY_BACKOFF_MAX"),
+    "retry_backoff_factor": _env_float("COSMOSDB_RETRY_BACKOFF_FACTOR"),
+    "enable_endpoint_discovery": _env_bool("COSMOSDB_ENABLE_ENDPOINT_DISCOVERY"),
 }
 
+def _backend() -> str:
+    """Return the configured backend: "cosmos" (default) or "memory"."""
+    backend = os.environ.get("COSMOSDB_BACKEND", "cosmos").strip().lower()
+    if backend not in ("cosmos", "memory"):
+        raise ValueError(f"Unknown COSMOSDB_BACKEND '{backend}'. Valid options: cosmos, memory")
+    return backend
+
+def _create_memory_container(container_name: str) -> InMemoryContainerProxy:
+    # Simulated round trips; see memory_backend for what each option emulates
+    options = {
+        "latency_ms": _env_float("MEMORY_BACKEND_LATENCY_MS"),
+        "jitter_ms": _env_float("MEMORY_BACKEND_JITTER_MS"),
+        "throttle_rate": _env_float("MEMORY_BACKEND_THROTTLE_RATE"),
+        "retry_after_ms": _env_float("MEMORY_BACKEND_RETRY_AFTER_MS"),
+    }
+    return InMemoryContainerProxy(
+        container_name, **{key: value for key, value in options.items() if value is not None}
+    )
+
+def _create_session() -> aiohttp.ClientSession:
+    connector_options: Dict[str, Any] = {}
+    if POOL_LIMIT is not None:
+        connector_options["limit"] = POOL_LIMIT
+    if POOL_LIMIT_PER_HOST is not None:
+        connector_options["limit_per_host"] = POOL_LIMIT_PER_HOST
+    if KEEPALIVE_TIMEOUT is not None:
+        connector_options["keepalive_timeout"] = KEEPALIVE_TIMEOUT
+    connector = aiohttp.TCPConnector(**connector_options)
+    # Same session settings azure-core uses when it owns the session
+    return aiohttp.ClientSession(
+        connector=connector,
+        trust_env=True,
+        cookie_jar=aiohttp.DummyCookieJar(),
+        auto_decompress=False,
+    )
+
 async def _ensure_client() -> CosmosClient:
-    global _client, _credential
+    global _client, _credential, _session
     if _client is None:
         _credential = DefaultAzureCredential()
-        _client = CosmosClient(COSMOSDB_ENDPOINT, _credential)
+        # The session must be created inside the running event loop
+        _session = _create_session()
+        transport = AioHttpTransport(session=_session, session_owner=False)
+        options = {key: value for key, value in CLIENT_OPTIONS.items() if value is not None}
+        _client = CosmosClient(
+            _require_env("COSMOSDB_ENDPOINT"),
+            _credential,
+            transport=transport,
+            # Every backend attempt feeds the per-request RU / latency totals
+            raw_request_hook=on_pipeline_request,
+            raw_response_hook=on_pipeline_response,
+            **options,
+        )
     return _client
 
 async def get_container(container_type: ContainerType) -> ContainerProxy:
-    container_name = CONTAINERS.get(container_type)
-    if not container_name:
+    container = _containers.get(container_type)
+    if container is not None:
+        return container
+
+    setting = CONTAINER_SETTINGS.get(container_type)
+    if not setting:
         raise ValueError(
             f"Container '{container_type}' not configured. "
-            f"Valid options: {list(CONTAINERS.keys())}"
+            f"Valid options: {[str(key.value) for key in CONTAINER_SETTINGS]}"
         )
 
-    client = await _ensure_client()
-    database = client.get_database_client(DATABASE_NAME)
-    return database.get_container_client(container_name)
+    if _backend() == "memory":
+        container = _create_memory_container(os.environ.get(setting) or container_type.value)
+    else:
+        client = await _ensure_client()
+        database = client.get_database_client(_require_env("COSMOSDB_DATABASE"))
+        container = database.get_container_client(_require_env(setting))
+    _containers[container_type] = container
+    return container
+
+def use_container(container_type: ContainerType, container: Any) -> None:
+    """
+    Register the container proxy to serve a container type, e.g. an
+    InMemoryContainerProxy for tests and benchmarks. Cleared by close_client().
+    """
+    _containers[container_type] = container
+    _container_properties.pop(container_type, None)
+
+async def get_container_properties(container_type: ContainerType) -> Dict[str, Any]:
+    """
+    Return the cached container properties, reading them from Cosmos DB once.
+
+    The read also primes the SDK's own properties cache, so the partition key
+    definition is not fetched again on the first item operation.
+    """
+    properties = _container_properties.get(container_type)
+    if properties is None:
+        container = await get_container(container_type)
+        properties = await container.read()
+        _container_properties[container_type] = properties
+    return properties
+
+async def get_products_container() -> ContainerProxy:
+    """FastAPI dependency returning the cached products container proxy."""
+    container = _containers.get(ContainerType.PRODUCTS)
+    if container is None:
+        container = await get_container(ContainerType.PRODUCTS)
+    return container
+
+async def warm_up() -> None:
+    """
+    Pre-warm the Cosmos DB client so the first request doesn't pay for it.
+
+    Opens the client (account metadata fetch), acquires an AAD token so the
+    credential chain is resolved and cached, then resolves every configured
+    container into the registry and caches its properties as a cheap read.
+    """
+    if _backend() == "cosmos":
+        client = await _ensure_client()
+        # Entering the client opens the transport and reads account metadata
+        await client.__aenter__()
+
+        endpoint = urlparse(_require_env("COSMOSDB_ENDPOINT"))
+        await _credential.get_token(f"{endpoint.scheme}://{endpoint.netloc}/.default")
+
+    for container_type in ContainerType:
+        await get_container_properties(container_type)
 
+async def close_client() -> None:
+    """Close the Cosmos DB client and credential, releasing their aiohttp sessions."""
+    global _client, _credential, _session
+    _containers.clear()
+    _container_properties.clear()
+    if _client is not None:
+        await _client.close()
+        _client = None
+    if _credential is not None:
+        await _credential.close()
+        _credential = None
+    if _session is not None:
+        await _session.close()
+        _session = None
@@ -19,3 +19,19 @@ class DatabaseError(ApplicationError):
 class PreconditionFailedError(ApplicationError):
     """Raised when an optimistic concurrency check fails (ETag mismatch)."""
     pass
+
+class ProductNotModifiedError(ApplicationError):
+    """Raised when a conditional read finds the product unchanged (ETag match)."""
+    pass
+
+class StockConditionFailedError(ApplicationError):
+    """Raised when a stock adjustment's quantity condition is not met."""
+    pass
+
+class ReservationNotFoundError(ApplicationError):
+    """Raised when a reservation hold doesn't exist or was already settled."""
+    pass
+
+class ReservationExpiredError(ApplicationError):
+    """Raised when confirming a reservation whose hold has lapsed."""
+    pass
@@ -1,6 +1,15 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import random
+from datetime import datetime, timezone
+from typing import Dict
+
+import opentelemetry.metrics
 import opentelemetry.trace
+import orjson
 from azure.monitor.opentelemetry import configure_azure_monitor
 
 # Configure Azure Monitor (this automatically sets up connection to Application Insights)
@@ -15,6 +24,89 @@ if os.environ.get("FUNCTIONS_WORKER_RUNTIME"):
 # Get a tracer for the current module (for distributed tracing)
 tracer = opentelemetry.trace.get_tracer("inventory_api")
 
+# Get a meter for application metrics (exported alongside traces)
+meter = opentelemetry.metrics.get_meter("inventory_api")
+
+# "json" (one object per line, extra fields included) or "text"
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json").strip().lower()
+
+# Attributes every LogRecord has; anything else on a record came from extra=
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects, including their extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue records as they are, without formatting them first.
+
+    The stock QueueHandler merges the message with its args and renders the
+    traceback on the calling thread so records can be pickled. The queue
+    here never leaves the process, so all of that is left to the listener
+    thread and the event loop only pays for enqueueing the record.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class SampledLogger(logging.LoggerAdapter):
+    """
+    Logger that keeps a fraction of its INFO and DEBUG records; WARNING and above always pass.
+
+    The sampling decision is made in isEnabledFor, before a LogRecord is
+    built, so dropped records cost no caller lookup, no formatting and never
+    reach the queue or the root logger's handlers (the Functions host, Azure
+    Monitor).
+    """
+
+    def __init__(self, logger: logging.Logger, rate: float):
+        super().__init__(logger, None)
+        self.rate = rate
+
+    def process(self, msg, kwargs):
+        # Keep the call's own extra= (the base class replaces it with the adapter's)
+        return msg, kwargs
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level) and (level >= logging.WARNING or random.random() < self.rate)
+
+
+def _parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse "name=rate,..." (names relative to inventory_api, "*" for the default)."""
+    rates = {}
+    for entry in value.split(","):
+        name, sep, rate = entry.partition("=")
+        if not sep:
+            continue
+        try:
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+# INFO sample rates per child logger, e.g. "*=0.1,crud.product_batch=1"
+LOG_INFO_SAMPLE_RATES = _parse_sample_rates(os.environ.get("LOG_INFO_SAMPLE_RATES", ""))
+
 # Configure the logger
 logger = logging.getLogger("inventory_api")
 
@@ -25,17 +117,27 @@ if not logger.handlers:
     # Console handler for local development and Azure Functions console
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
-    
-    # Create formatter
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
-    # Add formatter to handler
-    console_handler.setFormatter(formatter)
-    
-    # Add handler to logger
-    logger.addHandler(console_handler)
+
+    if LOG_FORMAT == "text":
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    else:
+        console_handler.setFormatter(JsonFormatter())
+
+    # Records are handed to a queue on the request path; the listener thread
+    # formats them and does the blocking write to the console
+    log_queue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(log_queue, console_handler, respect_handler_level=True)
+    log_listener.start()
+    # Flush what is still queued when the worker exits
+    atexit.register(log_listener.stop)
+
+    logger.addHandler(DeferredQueueHandler(log_queue))
 
 # Helper function to create child loggers
 def get_child_logger(name):
-    """Get a child logger with the given name."""
-    return logger.getChild(name)
\ No newline at end of file
+    """Get a child logger with the given name, sampled per LOG_INFO_SAMPLE_RATES."""
+    child = logger.getChild(name)
+    rate = LOG_INFO_SAMPLE_RATES.get(name, LOG_INFO_SAMPLE_RATES.get("*", 1.0))
+    if rate < 1.0:
+        return SampledLogger(child, rate)
+    return child
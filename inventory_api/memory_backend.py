@@ -0,0 +1,545 @@
+"""
+In-memory stand-in for the Cosmos DB ContainerProxy used by the CRUD layer.
+
+Selected with COSMOSDB_BACKEND=memory, so the API can be run, load-tested
+and benchmarked without a Cosmos DB account. It covers the calls the app
+makes (point reads and writes, patch, transactional batch, and the subset of
+SQL the app issues) and can inject latency and 429 throttling. Throttled
+calls are retried the way the SDK does.
+"""
+
+import asyncio
+import copy
+import random
+import re
+import time
+import uuid
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosBatchOperationError,
+    CosmosHttpResponseError,
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError,
+)
+
+from inventory_api.request_metrics import record_backend_response
+
+# Transactional batch limit enforced by the service
+MAX_BATCH_OPERATIONS = 100
+
+# Rough request charges, enough to make RU accounting meaningful locally
+READ_CHARGE = 1.0
+WRITE_CHARGE = 6.0
+QUERY_BASE_CHARGE = 2.5
+QUERY_CHARGE_PER_DOCUMENT = 0.05
+
+_QUERY_PATTERN = re.compile(
+    r"^\s*SELECT\s+(?P<select>.+?)\s+FROM\s+c(?:\s+WHERE\s+(?P<where>.+?))?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_CONDITION_PATTERN = re.compile(r"^c\.(?P<path>[\w.]+)\s*(?P<op>=|!=|<>|<=|>=|<|>)\s*(?P<operand>.+)$")
+_DEFINED_PATTERN = re.compile(r"^(?P<not>NOT\s+)?IS_DEFINED\(c\.(?P<path>[\w.]+)\)$", re.IGNORECASE)
+_AGGREGATE_PATTERN = re.compile(
+    r"^(?P<func>COUNT|SUM|MIN|MAX|AVG)\((?P<expr>.+)\)\s+AS\s+(?P<alias>\w+)$", re.IGNORECASE
+)
+
+_UNDEFINED = object()
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<>": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+def _lookup(document: Dict[str, Any], path: str) -> Any:
+    value: Any = document
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return _UNDEFINED
+        value = value[key]
+    return value
+
+
+def _operand(text: str, parameters: Dict[str, Any]) -> Any:
+    text = text.strip()
+    if text.startswith("@"):
+        return parameters[text]
+    if text[0] in "'\"" and text[-1] == text[0]:
+        return text[1:-1]
+    literals = {"true": True, "false": False, "null": None}
+    if text.lower() in literals:
+        return literals[text.lower()]
+    return float(text) if "." in text else int(text)
+
+
+def _compile_where(where: Optional[str], parameters: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """Compile AND-joined comparisons and IS_DEFINED checks into a predicate."""
+    if not where:
+        return lambda document: True
+
+    checks = []
+    for condition in re.split(r"\s+AND\s+", where.strip(), flags=re.IGNORECASE):
+        condition = condition.strip()
+        defined = _DEFINED_PATTERN.match(condition)
+        if defined:
+            path, negate = defined.group("path"), bool(defined.group("not"))
+            checks.append(lambda d, p=path, n=negate: (_lookup(d, p) is _UNDEFINED) == n)
+            continue
+        comparison = _CONDITION_PATTERN.match(condition)
+        if not comparison:
+            raise ValueError(f"Unsupported condition for the in-memory backend: {condition}")
+        path = comparison.group("path")
+        compare = _COMPARISONS[comparison.group("op")]
+        expected = _operand(comparison.group("operand"), parameters)
+
+        def check(d, p=path, c=compare, e=expected):
+            value = _lookup(d, p)
+            if value is _UNDEFINED:
+                return False
+            try:
+                return c(value, e)
+            except TypeError:
+                return False
+
+        checks.append(check)
+    return lambda document: all(check(document) for check in checks)
+
+
+def _evaluate(expression: str, document: Dict[str, Any]) -> Any:
+    """Evaluate a product of fields and numbers, e.g. "c.price * c.quantity"."""
+    result: Any = 1
+    for factor in expression.split("*"):
+        factor = factor.strip()
+        if factor.startswith("c."):
+            value = _lookup(document, factor[2:])
+        else:
+            value = _operand(factor, {})
+        if value is _UNDEFINED or not isinstance(value, (int, float)):
+            return _UNDEFINED
+        result *= value
+    return result
+
+
+def _aggregate(items: List[Tuple[str, str, str]], documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {}
+    for func, expression, alias in items:
+        if func == "COUNT":
+            row[alias] = len(documents)
+            continue
+        values = [v for v in (_evaluate(expression, d) for d in documents) if v is not _UNDEFINED]
+        # Like Cosmos DB, aggregates over no values are undefined (omitted)
+        if not values:
+            continue
+        if func == "SUM":
+            row[alias] = sum(values)
+        elif func == "MIN":
+            row[alias] = min(values)
+        elif func == "MAX":
+            row[alias] = max(values)
+        else:
+            row[alias] = sum(values) / len(values)
+    return row
+
+
+def run_query(
+    documents: List[Dict[str, Any]], query: str, parameters: Optional[List[Dict[str, Any]]] = None
+) -> List[Any]:
+    """
+    Run a Cosmos DB SQL query over documents.
+
+    Supports the subset the app uses: SELECT *, field projections, TOP,
+    DISTINCT VALUE / VALUE, COUNT/SUM/MIN/MAX/AVG aggregates, and WHERE
+    clauses of AND-joined comparisons and IS_DEFINED checks.
+
+    Raises:
+        ValueError: If the query uses unsupported syntax
+    """
+    match = _QUERY_PATTERN.match(query)
+    if not match:
+        raise ValueError(f"Unsupported query for the in-memory backend: {query}")
+    values = {parameter["name"]: parameter["value"] for parameter in parameters or []}
+    predicate = _compile_where(match.group("where"), values)
+    matched = [document for document in documents if predicate(document)]
+
+    select = match.group("select").strip()
+    limit = None
+    top = re.match(r"^TOP\s+(\d+)\s+(.+)$", select, re.IGNORECASE | re.DOTALL)
+    if top:
+        limit, select = int(top.group(1)), top.group(2).strip()
+
+    value_select = re.match(r"^(DISTINCT\s+)?VALUE\s+c\.([\w.]+)$", select, re.IGNORECASE)
+    if value_select:
+        results = [v for v in (_lookup(d, value_select.group(2)) for d in matched) if v is not _UNDEFINED]
+        if value_select.group(1):
+            results = list(dict.fromkeys(results))
+    elif select == "*":
+        results = [copy.deepcopy(document) for document in matched]
+    else:
+        columns = [column.strip() for column in select.split(",")]
+        aggregates = [_AGGREGATE_PATTERN.match(column) for column in columns]
+        if all(aggregates):
+            items = [(m.group("func").upper(), m.group("expr"), m.group("alias")) for m in aggregates]
+            return [_aggregate(items, matched)]
+        if not all(column.startswith("c.") for column in columns):
+            raise ValueError(f"Unsupported projection for the in-memory backend: {select}")
+        results = []
+        for document in matched:
+            projected = {}
+            for column in columns:
+                value = _lookup(document, column[2:])
+                if value is not _UNDEFINED:
+                    projected[column[2:].split(".")[-1]] = copy.deepcopy(value)
+            results.append(projected)
+
+    return results[:limit] if limit is not None else results
+
+
+def _apply_patch(document: Dict[str, Any], patch_operations: List[Dict[str, Any]]) -> None:
+    for operation in patch_operations:
+        *parents, key = operation["path"].strip("/").split("/")
+        target = document
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        op = operation["op"]
+        if op in ("set", "add", "replace"):
+            if op == "replace" and key not in target:
+                raise ValueError(f"Path {operation['path']} does not exist")
+            target[key] = copy.deepcopy(operation["value"])
+        elif op == "incr":
+            target[key] = target.get(key, 0) + operation["value"]
+        elif op == "remove":
+            target.pop(key, None)
+        else:
+            raise ValueError(f"Unsupported patch operation: {op}")
+
+
+class _PageIterator:
+    """Async iterator of query pages exposing continuation_token like the SDK."""
+
+    def __init__(self, container: "InMemoryContainerProxy", results: List[Any], page_size: int,
+                 continuation_token: Optional[str], response_hook: Optional[Callable]):
+        self._container = container
+        self._results = results
+        self._page_size = page_size
+        self._offset = int(continuation_token) if continuation_token else 0
+        self._response_hook = response_hook
+        self._done = False
+        self.continuation_token = continuation_token
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._done:
+            raise StopAsyncIteration
+        page = self._results[self._offset:self._offset + self._page_size]
+        charge = QUERY_BASE_CHARGE + QUERY_CHARGE_PER_DOCUMENT * len(page)
+        headers = await self._container._round_trip(charge)
+        self._offset += len(page)
+        self._done = self._offset >= len(self._results)
+        self.continuation_token = None if self._done else str(self._offset)
+        if self._response_hook:
+            self._response_hook(headers, page)
+        return _Page(page)
+
+
+class _Page:
+    def __init__(self, items: List[Any]):
+        self._items = items
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for item in self._items:
+            yield item
+
+
+class _QueryIterable:
+    """Result of query_items: iterate items directly or page with by_page()."""
+
+    def __init__(self, container: "InMemoryContainerProxy", query: str,
+                 parameters: Optional[List[Dict[str, Any]]], partition_key: Optional[str],
+                 feed_range: Optional[Dict[str, Any]], max_item_count: Optional[int],
+                 response_hook: Optional[Callable]):
+        self._container = container
+        self._query = query
+        self._parameters = parameters
+        self._partition_key = partition_key
+        self._feed_range = feed_range
+        self._page_size = max_item_count or 100
+        self._response_hook = response_hook
+
+    def by_page(self, continuation_token: Optional[str] = None) -> _PageIterator:
+        documents = self._container._scan(self._partition_key, self._feed_range)
+        results = run_query(documents, self._query, self._parameters)
+        return _PageIterator(
+            self._container, results, self._page_size, continuation_token, self._response_hook
+        )
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        async for page in self.by_page():
+            async for item in page:
+                yield item
+
+
+class InMemoryContainerProxy:
+    """
+    Dictionary-backed stand-in for azure.cosmos.aio.ContainerProxy.
+
+    Args:
+        container_id: Container name reported by read()
+        partition_key_path: Partition key path, e.g. "/category"
+        latency_ms: Simulated round-trip latency per backend call
+        jitter_ms: Random extra latency added on top, uniformly distributed
+        throttle_rate: Fraction of backend calls answered with 429
+        retry_after_ms: Retry-after reported on a simulated 429
+        max_throttle_retries: 429s retried per call before the error surfaces
+        feed_range_count: Number of feed ranges reported by read_feed_ranges()
+    """
+
+    def __init__(
+        self,
+        container_id: str = "products",
+        partition_key_path: str = "/category",
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after_ms: float = 10.0,
+        max_throttle_retries: int = 9,
+        feed_range_count: int = 4,
+    ):
+        self.id = container_id
+        self.partition_key_path = partition_key_path
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.throttle_rate = throttle_rate
+        self.retry_after_ms = retry_after_ms
+        self.max_throttle_retries = max_throttle_retries
+        self.feed_range_count = feed_range_count
+        self._items: Dict[Tuple[Any, str], Dict[str, Any]] = {}
+
+    # Simulated transport
+
+    async def _round_trip(self, request_charge: float) -> Dict[str, str]:
+        """Wait out the simulated latency, injecting (and retrying) 429s."""
+        throttle_retries = 0
+        while True:
+            started = time.perf_counter()
+            delay_ms = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+            if delay_ms > 0:
+                await asyncio.sleep(delay_ms / 1000.0)
+            else:
+                # Still yield to the loop, like any real network call
+                await asyncio.sleep(0)
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+            if self.throttle_rate and random.random() < self.throttle_rate:
+                headers = {"x-ms-retry-after-ms": str(self.retry_after_ms), "x-ms-request-charge": "0"}
+                record_backend_response(headers, 429, elapsed_ms)
+                if throttle_retries >= self.max_throttle_retries:
+                    error = CosmosHttpResponseError(status_code=429, message="Request rate is large.")
+                    error.headers = headers
+                    raise error
+                throttle_retries += 1
+                await asyncio.sleep(self.retry_after_ms / 1000.0)
+                continue
+
+            headers = {
+                "x-ms-request-charge": f"{request_charge:.2f}",
+                "x-ms-request-duration-ms": f"{elapsed_ms:.3f}",
+            }
+            record_backend_response(headers, 200, elapsed_ms)
+            return headers
+
+    # Storage helpers
+
+    def _partition_key_of(self, document: Dict[str, Any]) -> Any:
+        value = _lookup(document, self.partition_key_path.strip("/").replace("/", "."))
+        return None if value is _UNDEFINED else value
+
+    def _scan(self, partition_key: Optional[Any], feed_range: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if partition_key is not None:
+            return [doc for (pk, _), doc in self._items.items() if pk == partition_key]
+        if feed_range is not None:
+            return [
+                doc for (pk, _), doc in self._items.items()
+                if zlib.crc32(str(pk).encode()) % feed_range["count"] == feed_range["index"]
+            ]
+        return list(self._items.values())
+
+    @staticmethod
+    def _stamp(document: Dict[str, Any]) -> Dict[str, Any]:
+        document["_etag"] = f'"{uuid.uuid4()}"'
+        document["_ts"] = int(time.time())
+        document.setdefault("_rid", uuid.uuid4().hex[:16])
+        document.setdefault("_self", f"dbs/local/colls/local/docs/{document['_rid']}/")
+        document.setdefault("_attachments", "attachments/")
+        return document
+
+    @staticmethod
+    def _check_etag(document: Dict[str, Any], etag: Optional[str], match_condition=None,
+                    headers: Optional[Dict[str, str]] = None) -> None:
+        if_match = (headers or {}).get("if-match")
+        if etag is not None and match_condition == MatchConditions.IfNotModified:
+            if_match = etag
+        if if_match is not None and document["_etag"] != if_match:
+            raise CosmosAccessConditionFailedError(
+                status_code=412, message="Operation cannot be performed because one of the specified precondition is not met."
+            )
+
+    def _get(self, items: Dict, item: Any, partition_key: Any) -> Dict[str, Any]:
+        item_id = item["id"] if isinstance(item, dict) else item
+        document = items.get((partition_key, item_id))
+        if document is None:
+            raise CosmosResourceNotFoundError(status_code=404, message="Entity with the specified id does not exist in the system.")
+        return document
+
+    def _create(self, items: Dict, body: Dict[str, Any]) -> Dict[str, Any]:
+        key = (self._partition_key_of(body), body["id"])
+        if key in items:
+            raise CosmosResourceExistsError(status_code=409, message="Entity with the specified id already exists in the system.")
+        document = self._stamp(copy.deepcopy(body))
+        items[key] = document
+        return copy.deepcopy(document)
+
+    def _patch(self, items: Dict, item: str, partition_key: Any, patch_operations: List[Dict[str, Any]],
+               filter_predicate: Optional[str] = None, etag: Optional[str] = None,
+               match_condition=None, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        document = self._get(items, item, partition_key)
+        self._check_etag(document, etag, match_condition, headers)
+        if filter_predicate and not _compile_where(
+            re.sub(r"^\s*FROM\s+c\s+WHERE\s+", "", filter_predicate, flags=re.IGNORECASE), {}
+        )(document):
+            raise CosmosAccessConditionFailedError(status_code=412, message="Conditional request failed: filter predicate not satisfied.")
+        updated = copy.deepcopy(document)
+        try:
+            _apply_patch(updated, patch_operations)
+        except ValueError as e:
+            raise CosmosHttpResponseError(status_code=400, message=str(e)) from e
+        items[(partition_key, document["id"])] = self._stamp(updated)
+        return copy.deepcopy(updated)
+
+    def _delete(self, items: Dict, item: str, partition_key: Any, etag: Optional[str] = None,
+                match_condition=None, headers: Optional[Dict[str, str]] = None) -> None:
+        document = self._get(items, item, partition_key)
+        self._check_etag(document, etag, match_condition, headers)
+        del items[(partition_key, document["id"])]
+
+    # ContainerProxy surface
+
+    async def read(self, **kwargs) -> Dict[str, Any]:
+        await self._round_trip(READ_CHARGE)
+        return {"id": self.id, "partitionKey": {"paths": [self.partition_key_path], "kind": "Hash"}}
+
+    async def read_item(self, item: Any, partition_key: Any, initial_headers: Optional[Dict[str, str]] = None,
+                        **kwargs) -> Dict[str, Any]:
+        await self._round_trip(READ_CHARGE)
+        document = self._get(self._items, item, partition_key)
+        if_none_match = (initial_headers or {}).get("If-None-Match")
+        if if_none_match is not None and if_none_match == document["_etag"]:
+            # 304 Not Modified: the SDK returns an empty body
+            return {}
+        return copy.deepcopy(document)
+
+    async def create_item(self, body: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        await self._round_trip(WRITE_CHARGE)
+        return self._create(self._items, body)
+
+    async def upsert_item(self, body: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        await self._round_trip(WRITE_CHARGE)
+        self._items.pop((self._partition_key_of(body), body["id"]), None)
+        return self._create(self._items, body)
+
+    async def patch_item(self, item: Any, partition_key: Any, patch_operations: List[Dict[str, Any]], *,
+                         filter_predicate: Optional[str] = None, etag: Optional[str] = None,
+                         match_condition=None, headers: Optional[Dict[str, str]] = None,
+                         **kwargs) -> Dict[str, Any]:
+        await self._round_trip(WRITE_CHARGE)
+        return self._patch(self._items, item, partition_key, patch_operations,
+                           filter_predicate, etag, match_condition, headers)
+
+    async def delete_item(self, item: Any, partition_key: Any, *, etag: Optional[str] = None,
+                          match_condition=None, headers: Optional[Dict[str, str]] = None, **kwargs) -> None:
+        await self._round_trip(WRITE_CHARGE)
+        self._delete(self._items, item, partition_key, etag, match_condition, headers)
+
+    def query_items(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None,
+                    partition_key: Optional[Any] = None, max_item_count: Optional[int] = None,
+                    response_hook: Optional[Callable] = None, feed_range: Optional[Dict[str, Any]] = None,
+                    **kwargs) -> _QueryIterable:
+        return _QueryIterable(self, query, parameters, partition_key, feed_range, max_item_count, response_hook)
+
+    async def read_feed_ranges(self, **kwargs):
+        for index in range(self.feed_range_count):
+            yield {"index": index, "count": self.feed_range_count}
+
+    async def execute_item_batch(self, batch_operations: List[Tuple[str, Tuple[Any, ...], Dict[str, Any]]],
+                                 partition_key: Any, **kwargs) -> List[Dict[str, Any]]:
+        """Apply the operations atomically: all of them, or none if any fails."""
+        if len(batch_operations) > MAX_BATCH_OPERATIONS:
+            raise CosmosHttpResponseError(
+                status_code=400, message=f"Batch request has more operations than what is supported ({MAX_BATCH_OPERATIONS})."
+            )
+        await self._round_trip(WRITE_CHARGE * len(batch_operations))
+
+        staged = dict(self._items)
+        responses: List[Dict[str, Any]] = []
+        failed_index = None
+        for index, (operation, args, options) in enumerate(batch_operations):
+            options = dict(options)
+            if_match = options.pop("if_match_etag", None)
+            headers = {"if-match": if_match} if if_match else None
+            try:
+                if operation == "create":
+                    body = self._create(staged, args[0])
+                    responses.append({"statusCode": 201, "resourceBody": body, "eTag": body["_etag"]})
+                elif operation == "upsert":
+                    staged.pop((partition_key, args[0]["id"]), None)
+                    body = self._create(staged, args[0])
+                    responses.append({"statusCode": 200, "resourceBody": body, "eTag": body["_etag"]})
+                elif operation == "patch":
+                    body = self._patch(staged, args[0], partition_key, args[1],
+                                       filter_predicate=options.get("filter_predicate"), headers=headers)
+                    responses.append({"statusCode": 200, "resourceBody": body, "eTag": body["_etag"]})
+                elif operation == "delete":
+                    self._delete(staged, args[0], partition_key, headers=headers)
+                    responses.append({"statusCode": 204})
+                elif operation == "read":
+                    body = copy.deepcopy(self._get(staged, args[0], partition_key))
+                    responses.append({"statusCode": 200, "resourceBody": body, "eTag": body["_etag"]})
+                else:
+                    raise CosmosHttpResponseError(status_code=400, message=f"Unsupported batch operation: {operation}")
+            except CosmosHttpResponseError as e:
+                responses.append({"statusCode": e.status_code})
+                failed_index = index
+                break
+
+        if failed_index is not None:
+            # The failing operation keeps its status; every other one is a failed dependency
+            operation_responses = [
+                {"statusCode": 424} for _ in range(len(batch_operations))
+            ]
+            operation_responses[failed_index] = responses[failed_index]
+            raise CosmosBatchOperationError(
+                error_index=failed_index,
+                headers={},
+                status_code=responses[failed_index]["statusCode"],
+                message=f"There was an error in the transactional batch on index {failed_index}.",
+                operation_responses=operation_responses,
+            )
+
+        self._items = staged
+        return responses
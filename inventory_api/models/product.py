@@ -76,11 +76,8 @@ class ProductResponse(BaseModel):
     status: ProductStatus = ProductStatus.ACTIVE
     last_updated: datetime  # When the product was last modified
 
-    # Add Cosmos DB system fields as optional
-    _rid: Optional[str] = None
-    _self: Optional[str] = None
-    _attachments: Optional[str] = None
-    _ts: Optional[int] = None
+    # Cosmos DB system properties (_rid, _self, _ts, ...) are dropped as extras;
+    # private attributes for them were never populated and slowed every validation
 
     model_config = ConfigDict(
         extra="ignore",
@@ -100,6 +97,47 @@ class ProductResponse(BaseModel):
         return super().model_validate(obj, *args, **kwargs)
 
 
+class StockAdjustment(BaseModel):
+    """
+    Request model for an atomic stock increment or decrement.
+
+    The change is applied server-side with a patch "incr", so no prior read
+    or ETag is needed. Decrements are refused if they would make the stock
+    negative unless allow_negative is set.
+    """
+
+    delta: int  # Units to add (positive) or remove (negative)
+    min_quantity: Optional[int] = None  # Only apply if quantity is at least this
+    allow_negative: bool = False
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ProductBatchStockItem(StockAdjustment):
+    """
+    One line of a batch stock adjustment.
+    """
+
+    id: str
+    category: str
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ProductBatchStock(BaseModel):
+    """
+    Request model for adjusting the stock of multiple products at once.
+
+    Lines are grouped by category and each category is applied as one
+    transactional batch: if any line's condition fails, none of that
+    category's lines are applied.
+    """
+
+    items: List[ProductBatchStockItem]
+
+    model_config = ConfigDict(extra="forbid")
+
+
 class ProductBatchCreate(BaseModel):
     """
     Request model for creating multiple products in a single operation.
@@ -165,3 +203,111 @@ class ProductList(BaseModel):
     continuation_token: Optional[str] = None
 
     model_config = ConfigDict(extra="forbid")
+
+
+class ProductFields(BaseModel):
+    """
+    Subset of product fields returned by a projected listing.
+
+    Only the fields requested through ``fields=`` are present; everything
+    else is left unset and omitted from the response.
+    """
+
+    id: Optional[str] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+    price: Optional[float] = None
+    sku: Optional[str] = None
+    quantity: Optional[int] = None
+    etag: Optional[str] = Field(None, alias="_etag")
+    status: Optional[ProductStatus] = None
+    last_updated: Optional[datetime] = None
+
+    model_config = ConfigDict(extra="ignore", populate_by_name=True)
+
+
+class ProductFieldsList(BaseModel):
+    """
+    Response model for product listings with a field projection.
+    """
+
+    items: List[ProductFields]
+    continuation_token: Optional[str] = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BatchMode(str, Enum):
+    """
+    How a batch request is executed.
+    TRANSACTIONAL: Transactional batches per category; a failing item fails its batch
+    BULK: Independent point operations; each item succeeds or fails on its own
+    """
+
+    TRANSACTIONAL = "transactional"
+    BULK = "bulk"
+
+
+class BulkItemStatus(str, Enum):
+    """
+    Outcome of a single item in a bulk-mode or stock batch request.
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    CONFLICT = "conflict"
+    NOT_FOUND = "not_found"
+    PRECONDITION_FAILED = "precondition_failed"
+    INSUFFICIENT_STOCK = "insufficient_stock"
+    ROLLED_BACK = "rolled_back"  # Not applied because another item in its batch failed
+    THROTTLED = "throttled"
+    FAILED = "failed"
+
+
+class ProductBulkItemResult(BaseModel):
+    """
+    Result of one item in a bulk-mode batch request, in request order.
+    """
+
+    index: int  # Position of the item in the request
+    id: Optional[str] = None
+    status: BulkItemStatus
+    status_code: int  # Cosmos DB status code for the operation
+    product: Optional[ProductResponse] = None
+    error: Optional[str] = None
+
+
+class ProductBulkResult(BaseModel):
+    """
+    Response model for bulk-mode batch requests.
+    """
+
+    items: List[ProductBulkItemResult]
+    succeeded: int
+    failed: int
+    elapsed_seconds: float
+    items_per_second: float
+
+
+class CategoryStats(BaseModel):
+    """
+    Inventory totals for one category.
+    """
+
+    category: str
+    product_count: int
+    total_quantity: int
+    total_value: float  # Sum of price * quantity
+
+
+class ProductStats(BaseModel):
+    """
+    Response model for the product statistics endpoint.
+    """
+
+    categories: List[CategoryStats]
+    product_count: int
+    total_quantity: int
+    total_value: float
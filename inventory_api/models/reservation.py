@@ -0,0 +1,55 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+
+# Value of the "type" property marking reservation holds; product documents have none
+RESERVATION_DOCUMENT_TYPE = "reservation"
+
+# Longest hold a client can ask for; keeps the document ttl well inside int32
+MAX_HOLD_SECONDS = 7 * 24 * 3600
+
+
+class ReservationStatus(str, Enum):
+    """
+    Lifecycle of a stock reservation.
+    HELD: Stock is set aside until the hold expires
+    CONFIRMED: The sale went through; the stock stays deducted
+    RELEASED: The hold was cancelled and its stock returned
+    EXPIRED: The hold lapsed and its stock was returned
+    """
+
+    HELD = "held"
+    CONFIRMED = "confirmed"
+    RELEASED = "released"
+    EXPIRED = "expired"
+
+
+class ReservationCreate(BaseModel):
+    """
+    Request model for placing a hold on a product's stock.
+    """
+
+    product_id: str
+    category: str
+    quantity: int = Field(gt=0)
+    hold_seconds: Optional[int] = Field(None, gt=0, le=MAX_HOLD_SECONDS)  # Defaults to RESERVATION_HOLD_SECONDS
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ReservationResponse(BaseModel):
+    """
+    Response model for a stock reservation.
+
+    Holds are stored in the product's partition with a Cosmos DB TTL, so
+    abandoned ones are cleaned up without a client call.
+    """
+
+    id: str
+    product_id: str
+    category: str
+    quantity: int
+    status: ReservationStatus
+    expires_at: datetime
+    etag: str = Field(alias="_etag")
@@ -0,0 +1,143 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+import opentelemetry.trace
+
+# Cosmos DB retries these automatically (throttled / retry-with)
+RETRIED_STATUS_CODES = (429, 449)
+
+
+class RequestMetrics:
+    """Cosmos DB cost and latency accumulated over one HTTP request."""
+
+    def __init__(self):
+        self.request_charge = 0.0
+        self.backend_calls = 0
+        self.retries = 0
+        # Summed over calls, so concurrent calls can exceed the request's duration
+        self.backend_duration_ms = 0.0
+        self.server_duration_ms = 0.0
+        self.started = time.perf_counter()
+
+    def record(self, headers: Mapping[str, str], status_code: int, elapsed_ms: float) -> None:
+        """Add one backend response (every attempt, including retried ones)."""
+        self.request_charge += float(headers.get("x-ms-request-charge", 0) or 0)
+        self.server_duration_ms += float(headers.get("x-ms-request-duration-ms", 0) or 0)
+        self.backend_duration_ms += elapsed_ms
+        self.backend_calls += 1
+        if status_code in RETRIED_STATUS_CODES:
+            self.retries += 1
+
+    def total_duration_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def response_headers(self) -> Dict[str, str]:
+        """X-Request-Charge and Server-Timing headers for the HTTP response."""
+        return {
+            "X-Request-Charge": f"{self.request_charge:.2f}",
+            "Server-Timing": (
+                f'cosmos;dur={self.backend_duration_ms:.1f};'
+                f'desc="{self.backend_calls} calls, {self.retries} retries", '
+                f"cosmos-server;dur={self.server_duration_ms:.1f}, "
+                f"total;dur={self.total_duration_ms():.1f}"
+            ),
+        }
+
+    def span_attributes(self) -> Dict[str, Any]:
+        return {
+            "db.request_charge": round(self.request_charge, 2),
+            "db.backend_calls": self.backend_calls,
+            "db.retries": self.retries,
+            "db.backend_duration_ms": round(self.backend_duration_ms, 1),
+            "db.server_duration_ms": round(self.server_duration_ms, 1),
+        }
+
+
+_current_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def start_request_metrics() -> RequestMetrics:
+    """
+    Begin accounting for the current HTTP request.
+
+    Tasks spawned afterwards (batch fan-out) inherit the same accumulator.
+    """
+    metrics = RequestMetrics()
+    _current_metrics.set(metrics)
+    return metrics
+
+
+class BackendCall:
+    """Throttled attempts of one logical Cosmos DB call, SDK retries included."""
+
+    def __init__(self):
+        self.throttled_attempts = 0
+        self.retry_after_ms = 0.0
+
+
+_current_call: ContextVar[Optional[BackendCall]] = ContextVar("backend_call", default=None)
+
+
+@contextmanager
+def track_backend_call() -> Iterator[BackendCall]:
+    """
+    Collect the 429 responses of the Cosmos DB call made inside the block.
+
+    Each attempt is seen by the response hook as it happens, so the count
+    belongs to this call alone even with other calls in flight on the same
+    client. Use one block per task; concurrent tasks get their own.
+    """
+    call = BackendCall()
+    token = _current_call.set(call)
+    try:
+        yield call
+    finally:
+        _current_call.reset(token)
+
+
+def record_backend_response(
+    headers: Mapping[str, str], status_code: int, elapsed_ms: float
+) -> None:
+    """
+    Record a Cosmos DB response against the current request and operation span.
+
+    The running totals go to the request's accumulator; the individual call is
+    added as an event on the current span (the CRUD operation's span).
+    """
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.record(headers, status_code, elapsed_ms)
+
+    call = _current_call.get()
+    if call is not None and status_code == 429:
+        call.throttled_attempts += 1
+        call.retry_after_ms = float(headers.get("x-ms-retry-after-ms", 0) or 0)
+
+    span = opentelemetry.trace.get_current_span()
+    if span.is_recording():
+        span.add_event(
+            "cosmos.response",
+            {
+                "http.status_code": status_code,
+                "db.request_charge": float(headers.get("x-ms-request-charge", 0) or 0),
+                "db.server_duration_ms": float(headers.get("x-ms-request-duration-ms", 0) or 0),
+                "db.backend_duration_ms": round(elapsed_ms, 1),
+            },
+        )
+
+
+def on_pipeline_request(request) -> None:
+    """azure-core raw_request_hook: stamp the start of each backend attempt."""
+    request.context["request_metrics_started"] = time.perf_counter()
+
+
+def on_pipeline_response(response) -> None:
+    """azure-core raw_response_hook: record each backend attempt."""
+    started = response.context.get("request_metrics_started")
+    elapsed_ms = (time.perf_counter() - started) * 1000.0 if started else 0.0
+    http_response = response.http_response
+    record_backend_response(http_response.headers, http_response.status_code, elapsed_ms)
@@ -0,0 +1,28 @@
+"""
+JSON responses serialized with orjson.
+
+ORJSONResponse is the app's default response class. Routes return it with
+their already validated models as content, so FastAPI skips its own
+response-model validation and serialization pass: the models are dumped in
+Python mode and encoded to bytes by orjson in one step.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        # Python mode leaves datetimes and enums to orjson, which encodes them natively
+        return value.model_dump(by_alias=True)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson; content may be (or contain) pydantic models."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -1,10 +1,13 @@
-from typing import Optional
-from fastapi import APIRouter, Body, HTTPException, Header, Path, Query, status, Depends
+from typing import Optional, Union
+from fastapi import APIRouter, Body, HTTPException, Header, Path, Query, Response, status, Depends
 from inventory_api.models.product import (
     ProductCreate,
+    ProductFieldsList,
     ProductList,
     ProductUpdate,
-    ProductResponse
+    ProductResponse,
+    ProductStats,
+    StockAdjustment,
 )
 from inventory_api.crud.product_crud import (
     get_product_by_id,
@@ -12,19 +15,24 @@ from inventory_api.crud.product_crud import (
     create_product,
     delete_product,
     update_product,
+    adjust_stock,
     list_categories
 )
-from inventory_api.db import get_container, ContainerType
+from inventory_api.crud.product_crud_stats import get_product_stats
+from inventory_api.db import get_products_container
 from azure.cosmos.aio import ContainerProxy
 
 from inventory_api.exceptions import (
     PreconditionFailedError,
     ProductNotFoundError,
     ProductAlreadyExistsError,
+    ProductNotModifiedError,
+    StockConditionFailedError,
     DatabaseError
 )
 
 from inventory_api.logging_config import tracer, get_child_logger
+from inventory_api.responses import ORJSONResponse
 
 # Create a child logger for this module
 logger = get_child_logger("routes.product")
@@ -32,13 +40,10 @@ logger = get_child_logger("routes.product")
 router = APIRouter(prefix="/products", tags=["products"])
 
 
-async def get_products_container() -> ContainerProxy:
-    return await get_container(ContainerType.PRODUCTS)
-
 @router.get("/categories", response_model=list[str])
 async def get_categories(container: ContainerProxy = Depends(get_products_container)):
     try:
-        return await list_categories(container=container)
+        return ORJSONResponse(await list_categories(container=container))
     except DatabaseError as e:
         logger.error(f"Database error: {e}", exc_info=e.original_exception)
         raise HTTPException(
@@ -55,17 +60,46 @@ async def get_categories(container: ContainerProxy = Depends(get_products_contai
         )
 
 
-@router.get("/", response_model=ProductList)
+@router.get("/stats", response_model=ProductStats)
+async def get_stats(
+    category: Optional[str] = Query(None, title="Only report this category"),
+    container: ContainerProxy = Depends(get_products_container),
+):
+    try:
+        return ORJSONResponse(await get_product_stats(container=container, category=category))
+    except DatabaseError as e:
+        logger.error(f"Database error: {e}", exc_info=e.original_exception)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="A database error occurred.",
+        )
+    except Exception as e:
+        logger.error(
+            f"Unexpected error retrieving product stats: {e}", exc_info=True
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected internal server error occurred.",
+        )
+
+
+@router.get("/", response_model=Union[ProductList, ProductFieldsList])
 async def get_products(
     category: str = Query("electronics", title="The category to filter products by"),
     continuation_token: Optional[str] = Query(None, title="Token for pagination"),
     limit: int = Query(50, title="Maximum number of items to return"),
+    fields: Optional[str] = Query(
+        None,
+        title="Comma-separated fields to return, e.g. id,name,price,quantity",
+    ),
     container: ContainerProxy = Depends(get_products_container),
 ):
     with tracer.start_as_current_span("api_get_products") as span:
         span.set_attribute("category", category)
         span.set_attribute("limit", limit)
         span.set_attribute("has_continuation_token", continuation_token is not None)
+
+        field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
         
         logger.info(
             "Handling GET /products request",
@@ -82,17 +116,24 @@ async def get_products(
                 category=category,
                 max_items=limit,
                 continuation_token=continuation_token,
+                fields=field_list,
             )
             
             span.set_attribute("products.count", len(result.items))
             span.set_attribute("has_more_results", result.continuation_token is not None)
             
             logger.info(
-                f"Successfully retrieved {len(result.items)} products",
+                "Successfully retrieved %d products",
+                len(result.items),
                 extra={"count": len(result.items)}
             )
-            
-            return result
+
+            if field_list:
+                # Omit fields that were not requested instead of returning nulls
+                return ORJSONResponse(result.model_dump(by_alias=True, exclude_unset=True))
+            return ORJSONResponse(result)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except DatabaseError as e:
             span.set_attribute("error", True)
             span.set_attribute("error.type", "database_error")
@@ -127,7 +168,8 @@ async def add_new_product(
     container: ContainerProxy = Depends(get_products_container),
 ):
     try:
-        return await create_product(container=container, product=product)
+        product = await create_product(container=container, product=product)
+        return ORJSONResponse(product, status_code=status.HTTP_201_CREATED)
     except ProductAlreadyExistsError as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except DatabaseError as e:
@@ -185,13 +227,14 @@ async def update_existing_product(
     ),
 ):
     try:
-        return await update_product(
+        product = await update_product(
             container=container,
             product_id=product_id,
             category=category,
             updates=updated_product,
             etag=if_match_etag,
         )
+        return ORJSONResponse(product)
     except ProductNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except PreconditionFailedError as e:
@@ -214,15 +257,69 @@ async def update_existing_product(
         )
 
 
-@router.get("/{product_id}", response_model=ProductResponse)
+@router.post("/{product_id}/stock", response_model=ProductResponse)
+async def adjust_product_stock(
+    adjustment: StockAdjustment,
+    product_id: str = Path(..., title="The ID of the product to adjust"),
+    category: str = Query(..., title="The category of the product (partition key)"),
+    container: ContainerProxy = Depends(get_products_container),
+):
+    try:
+        product = await adjust_stock(
+            container=container,
+            product_id=product_id,
+            category=category,
+            adjustment=adjustment,
+        )
+        return ORJSONResponse(product)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ProductNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except StockConditionFailedError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except DatabaseError as e:
+        logger.error(
+            f"Database error during stock adjustment: {e}", exc_info=e.original_exception
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="A database error occurred.",
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error during stock adjustment: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected internal server error occurred.",
+        )
+
+
+@router.get(
+    "/{product_id}",
+    response_model=ProductResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Product unchanged since If-None-Match ETag"}},
+)
 async def get_product(
     product_id: str = Path(..., title="The ID of the product to retrieve"),
     category: str = Query(..., title="The category of the product (partition key)"),
     container: ContainerProxy = Depends(get_products_container),
+    if_none_match: Optional[str] = Header(
+        None,
+        alias="If-None-Match",
+        description="ETag from a previous GET; returns 304 if the product is unchanged",
+    ),
 ):
     try:
-        return await get_product_by_id(
-            container=container, product_id=product_id, category=category
+        product = await get_product_by_id(
+            container=container,
+            product_id=product_id,
+            category=category,
+            if_none_match=if_none_match,
+        )
+        return ORJSONResponse(product, headers={"ETag": product.etag})
+    except ProductNotModifiedError:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": if_none_match}
         )
     except ProductNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -1,35 +1,56 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import List, Union
+from fastapi import APIRouter, HTTPException, Query, status, Depends
 from inventory_api.models.product import (
     ProductResponse, 
     ProductBatchCreate,
     ProductBatchUpdate,
-    ProductBatchDelete
+    ProductBatchDelete,
+    ProductBatchStock,
+    BatchMode,
+    ProductBulkResult,
 )
 from inventory_api.crud.product_crud_batch import (
     create_products,
     update_products,
-    delete_products
+    delete_products,
+    bulk_create_products,
+    bulk_update_products,
+    bulk_delete_products,
+    adjust_products_stock,
 )
-from inventory_api.db import get_container, ContainerType
+from inventory_api.db import get_products_container
 from azure.cosmos.aio import ContainerProxy
 
 from inventory_api.exceptions import DatabaseError
 from inventory_api.logging_config import get_child_logger, tracer
+from inventory_api.responses import ORJSONResponse
 
 # Create a child logger for this module
 logger = get_child_logger("routes.product_batch")
 
 router = APIRouter(prefix="/products/batch", tags=["product-batch"])
 
+MODE_QUERY = Query(
+    BatchMode.TRANSACTIONAL,
+    title="transactional: per-category transactional batches; bulk: independent operations with per-item results",
+)
+
 
-async def get_products_container() -> ContainerProxy:
-    return await get_container(ContainerType.PRODUCTS)
+def _bulk_response(result: ProductBulkResult, status_code: int = status.HTTP_200_OK) -> ORJSONResponse:
+    # Some items failed: report per-item outcomes as Multi-Status
+    if result.failed:
+        status_code = status.HTTP_207_MULTI_STATUS
+    return ORJSONResponse(result, status_code=status_code)
 
 
-@router.post("/", response_model=List[ProductResponse], status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=Union[List[ProductResponse], ProductBulkResult],
+    status_code=status.HTTP_201_CREATED,
+)
 async def add_products_batch(
     batch_create: ProductBatchCreate,
+    mode: BatchMode = MODE_QUERY,
     container: ContainerProxy = Depends(get_products_container),
 ):
     with tracer.start_as_current_span("api_add_products_batch") as span:
@@ -39,9 +60,11 @@ async def add_products_batch(
         # Track categories in the batch
         categories = set(item.category for item in batch_create.items)
         span.set_attribute("batch.categories_count", len(categories))
+        span.set_attribute("batch.mode", mode.value)
         
         logger.info(
-            f"Handling batch create request for {batch_size} products",
+            "Handling batch create request for %d products",
+            batch_size,
             extra={
                 "batch_size": batch_size,
                 "categories": list(categories)
@@ -49,6 +72,11 @@ async def add_products_batch(
         )
         
         try:
+            if mode == BatchMode.BULK:
+                result = await bulk_create_products(container=container, batch_create=batch_create)
+                span.set_attribute("batch.success_count", result.succeeded)
+                return _bulk_response(result, status.HTTP_201_CREATED)
+
             result = await create_products(container=container, batch_create=batch_create)
             
             # Log success with metrics
@@ -57,7 +85,9 @@ async def add_products_batch(
             span.set_attribute("batch.success_rate", success_count / batch_size if batch_size > 0 else 1.0)
             
             logger.info(
-                f"Successfully created {success_count}/{batch_size} products",
+                "Successfully created %d/%d products",
+                success_count,
+                batch_size,
                 extra={
                     "success_count": success_count,
                     "batch_size": batch_size,
@@ -65,7 +95,7 @@ async def add_products_batch(
                 }
             )
             
-            return result
+            return ORJSONResponse(result, status_code=status.HTTP_201_CREATED)
         except DatabaseError as e:
             span.set_attribute("error", True)
             span.set_attribute("error.type", "database_error")
@@ -102,13 +132,17 @@ async def add_products_batch(
             )
 
 
-@router.patch("/", response_model=List[ProductResponse])
+@router.patch("/", response_model=Union[List[ProductResponse], ProductBulkResult])
 async def update_products_batch(
     batch_update: ProductBatchUpdate,
+    mode: BatchMode = MODE_QUERY,
     container: ContainerProxy = Depends(get_products_container),
 ):
     try:
-        return await update_products(container=container, batch_update=batch_update)
+        if mode == BatchMode.BULK:
+            result = await bulk_update_products(container=container, batch_update=batch_update)
+            return _bulk_response(result)
+        return ORJSONResponse(await update_products(container=container, batch_update=batch_update))
     except DatabaseError as e:
         logger.error(f"Database error: {e}", exc_info=e.original_exception)
         raise HTTPException(
@@ -125,13 +159,17 @@ async def update_products_batch(
         )
 
 
-@router.delete("/", response_model=List[str])
+@router.delete("/", response_model=Union[List[str], ProductBulkResult])
 async def delete_products_batch(
     batch_delete: ProductBatchDelete,
+    mode: BatchMode = MODE_QUERY,
     container: ContainerProxy = Depends(get_products_container),
 ):
     try:
-        return await delete_products(container=container, batch_delete=batch_delete)
+        if mode == BatchMode.BULK:
+            result = await bulk_delete_products(container=container, batch_delete=batch_delete)
+            return _bulk_response(result)
+        return ORJSONResponse(await delete_products(container=container, batch_delete=batch_delete))
     except DatabaseError as e:
         logger.error(f"Database error: {e}", exc_info=e.original_exception)
         raise HTTPException(
@@ -146,3 +184,29 @@ async def delete_products_batch(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected internal server error occurred.",
         )
+
+
+@router.post("/stock", response_model=ProductBulkResult)
+async def adjust_stock_batch(
+    batch_stock: ProductBatchStock,
+    container: ContainerProxy = Depends(get_products_container),
+):
+    try:
+        result = await adjust_products_stock(container=container, batch_stock=batch_stock)
+        return _bulk_response(result)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except DatabaseError as e:
+        logger.error(f"Database error: {e}", exc_info=e.original_exception)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="A database error occurred.",
+        )
+    except Exception as e:
+        logger.error(
+            f"Unexpected error during batch stock adjustment: {e}", exc_info=True
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected internal server error occurred.",
+        )
@@ -0,0 +1,88 @@
+from builtins import anext
+from typing import AsyncIterator, Literal
+
+from fastapi import APIRouter, HTTPException, Query, status, Depends
+from fastapi.responses import StreamingResponse
+from azure.cosmos.aio import ContainerProxy
+
+from inventory_api.crud.product_crud_export import export_catalog, export_products
+from inventory_api.db import get_products_container
+from inventory_api.exceptions import DatabaseError
+from inventory_api.logging_config import get_child_logger
+
+# Create a child logger for this module
+logger = get_child_logger("routes.product_export")
+
+router = APIRouter(prefix="/products/export", tags=["product-export"])
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+GZIP_MEDIA_TYPE = "application/gzip"
+
+
+async def _prepend(first: bytes, rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    yield first
+    async for chunk in rest:
+        yield chunk
+
+
+@router.get(
+    "",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def export_category(
+    category: str = Query(..., title="The category to export (partition key)"),
+    page_size: int = Query(1000, ge=1, le=10000, title="Documents read per Cosmos DB page"),
+    container: ContainerProxy = Depends(get_products_container),
+):
+    chunks = export_products(container=container, category=category, page_size=page_size)
+    try:
+        # Read the first page up front so database errors still map to a 500
+        first = await anext(chunks)
+    except StopAsyncIteration:
+        return StreamingResponse(iter(()), media_type=NDJSON_MEDIA_TYPE)
+    except DatabaseError as e:
+        logger.error(f"Database error: {e}", exc_info=e.original_exception)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="A database error occurred.",
+        )
+
+    return StreamingResponse(_prepend(first, chunks), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get(
+    "/all",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {NDJSON_MEDIA_TYPE: {}, GZIP_MEDIA_TYPE: {}}}},
+)
+async def export_all(
+    format: Literal["ndjson", "gzip"] = Query("ndjson", title="Output format"),
+    parallelism: int = Query(4, ge=1, le=64, title="Feed ranges read concurrently"),
+    page_size: int = Query(1000, ge=1, le=10000, title="Documents read per Cosmos DB page"),
+    container: ContainerProxy = Depends(get_products_container),
+):
+    compress = format == "gzip"
+    chunks = export_catalog(
+        container=container,
+        parallelism=parallelism,
+        page_size=page_size,
+        compress=compress,
+    )
+    media_type = GZIP_MEDIA_TYPE if compress else NDJSON_MEDIA_TYPE
+    headers = {
+        "Content-Disposition": f'attachment; filename="catalog.ndjson{".gz" if compress else ""}"'
+    }
+    try:
+        # Read the first chunk up front so database errors still map to a 500
+        first = await anext(chunks)
+    except StopAsyncIteration:
+        return StreamingResponse(iter(()), media_type=media_type, headers=headers)
+    except DatabaseError as e:
+        logger.error(f"Database error: {e}", exc_info=e.original_exception)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="A database error occurred.",
+        )
+
+    return StreamingResponse(_prepend(first, chunks), media_type=media_type, headers=headers)
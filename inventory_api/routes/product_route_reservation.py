@@ -0,0 +1,98 @@
+from fastapi import APIRouter, HTTPException, Path, Query, status, Depends
+from azure.cosmos.aio import ContainerProxy
+
+from inventory_api.crud.product_crud_reservation import (
+    confirm_reservation,
+    create_reservation,
+    release_reservation,
+)
+from inventory_api.db import get_products_container
+from inventory_api.exceptions import (
+    DatabaseError,
+    ProductNotFoundError,
+    ReservationExpiredError,
+    ReservationNotFoundError,
+    StockConditionFailedError,
+)
+from inventory_api.logging_config import get_child_logger
+from inventory_api.models.reservation import ReservationCreate, ReservationResponse
+from inventory_api.responses import ORJSONResponse
+
+# Create a child logger for this module
+logger = get_child_logger("routes.product_reservation")
+
+router = APIRouter(prefix="/products/reservations", tags=["product-reservations"])
+
+
+def _database_error(e: DatabaseError) -> HTTPException:
+    logger.error(f"Database error: {e}", exc_info=e.original_exception)
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail="A database error occurred.",
+    )
+
+
+def _unexpected_error(action: str, e: Exception) -> HTTPException:
+    logger.error(f"Unexpected error {action}: {e}", exc_info=True)
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail="An unexpected internal server error occurred.",
+    )
+
+
+@router.post("/", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
+async def add_reservation(
+    reservation: ReservationCreate,
+    container: ContainerProxy = Depends(get_products_container),
+):
+    try:
+        held = await create_reservation(container=container, reservation=reservation)
+        return ORJSONResponse(held, status_code=status.HTTP_201_CREATED)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ProductNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except StockConditionFailedError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except DatabaseError as e:
+        raise _database_error(e)
+    except Exception as e:
+        raise _unexpected_error("creating reservation", e)
+
+
+@router.post("/{reservation_id}/confirm", response_model=ReservationResponse)
+async def confirm_existing_reservation(
+    reservation_id: str = Path(..., title="The ID of the reservation to confirm"),
+    category: str = Query(..., title="The category of the reserved product (partition key)"),
+    container: ContainerProxy = Depends(get_products_container),
+):
+    try:
+        return ORJSONResponse(await confirm_reservation(
+            container=container, reservation_id=reservation_id, category=category
+        ))
+    except ReservationNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ReservationExpiredError as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    except DatabaseError as e:
+        raise _database_error(e)
+    except Exception as e:
+        raise _unexpected_error("confirming reservation", e)
+
+
+@router.post("/{reservation_id}/release", response_model=ReservationResponse)
+async def release_existing_reservation(
+    reservation_id: str = Path(..., title="The ID of the reservation to release"),
+    category: str = Query(..., title="The category of the reserved product (partition key)"),
+    container: ContainerProxy = Depends(get_products_container),
+):
+    try:
+        return ORJSONResponse(await release_reservation(
+            container=container, reservation_id=reservation_id, category=category
+        ))
+    except ReservationNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except DatabaseError as e:
+        raise _database_error(e)
+    except Exception as e:
+        raise _unexpected_error("releasing reservation", e)
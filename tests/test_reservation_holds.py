@@ -0,0 +1,93 @@
+"""
+Reservation holds share their product's partition but must never be written
+through the product endpoints.
+
+Runs the function app against the in-memory Cosmos DB backend.
+"""
+
+import asyncio
+import json
+import os
+from urllib.parse import urlencode
+
+os.environ.setdefault("COSMOSDB_BACKEND", "memory")
+
+import azure.functions as func  # noqa: E402
+
+import function_app  # noqa: E402
+from inventory_api.db import ContainerType, use_container  # noqa: E402
+from inventory_api.memory_backend import InMemoryContainerProxy  # noqa: E402
+
+CATEGORY = "tools"
+
+
+async def send(method, path, params=None, body=None, headers=None):
+    query = f"?{urlencode(params)}" if params else ""
+    request = func.HttpRequest(
+        method=method,
+        url=f"http://localhost:7071/{path}{query}",
+        headers={"x-functions-key": "test", "content-type": "application/json", **(headers or {})},
+        params=params or {},
+        route_params={"route": path},
+        body=json.dumps(body).encode() if body is not None else b"",
+    )
+    return await function_app.asgi_middleware.handle_async(request)
+
+
+async def create_hold():
+    """Create a product in an empty container and hold some of its stock."""
+    use_container(ContainerType.PRODUCTS, InMemoryContainerProxy())
+    response = await send(
+        "POST",
+        "products/",
+        body={"name": "Hammer", "category": CATEGORY, "price": 9.5, "sku": "HAM-1", "quantity": 10},
+    )
+    assert response.status_code == 201
+    product = json.loads(response.get_body())
+    response = await send(
+        "POST",
+        "products/reservations/",
+        body={"product_id": product["id"], "category": CATEGORY, "quantity": 3},
+    )
+    assert response.status_code == 201
+    return json.loads(response.get_body())
+
+
+def test_delete_of_a_hold_is_not_found():
+    async def scenario():
+        hold = await create_hold()
+        response = await send("DELETE", f"products/{hold['id']}", params={"category": CATEGORY})
+        assert response.status_code == 404
+        # The hold is untouched, so its stock can still be returned
+        response = await send(
+            "POST", f"products/reservations/{hold['id']}/release", params={"category": CATEGORY}
+        )
+        assert response.status_code == 200
+
+    asyncio.run(scenario())
+
+
+def test_patch_of_a_hold_is_not_found():
+    async def scenario():
+        hold = await create_hold()
+        response = await send(
+            "PATCH",
+            f"products/{hold['id']}",
+            params={"category": CATEGORY},
+            body={"quantity": 100},
+            headers={"If-Match": '"any"'},
+        )
+        assert response.status_code == 404
+
+    asyncio.run(scenario())
+
+
+def test_stock_adjustment_of_a_hold_is_not_found():
+    async def scenario():
+        hold = await create_hold()
+        response = await send(
+            "POST", f"products/{hold['id']}/stock", params={"category": CATEGORY}, body={"delta": 5}
+        )
+        assert response.status_code == 404
+
+    asyncio.run(scenario())